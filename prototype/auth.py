@@ -3,38 +3,147 @@
 Handles password hashing, staff account CRUD, session management with CSRF tokens.
 """
 
-import secrets
+import asyncio
+import base64
+import hashlib
+import os
 import sqlite3
-from datetime import datetime, timedelta
-from pathlib import Path
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from itertools import combinations
+from datetime import datetime, timedelta, timezone
 
 import bcrypt
+from argon2 import PasswordHasher
+from argon2 import exceptions as argon2_exceptions
+
+import db
 
-DB_PATH = Path(__file__).parent / "alerts.db"
 SESSION_EXPIRY_HOURS = 8
 
 
 def _get_conn():
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
-    return conn
+    return db.get_connection()
+
+
+def _iso(ts: datetime) -> str:
+    """Format a datetime as ISO-8601; strftime beats isoformat() on CPython."""
+    return ts.strftime("%Y-%m-%dT%H:%M:%S.%f")
+
+
+def _iso_now() -> str:
+    # now(timezone.utc), not the deprecated utcnow(); _iso has no offset
+    # directive so the stored text is unchanged.
+    return _iso(datetime.now(timezone.utc))
 
 
 # ==========================
 # Password hashing
 # ==========================
 
+# bcrypt/argon2 release the GIL, so hashing parallelizes across threads. A
+# dedicated pool keeps the KDF off the event loop when called from async
+# handlers.
+_BCRYPT_POOL = ThreadPoolExecutor(max_workers=os.cpu_count())
+
+# Argon2id: memory-hard and 3-5x faster to verify on CPU than bcrypt cost=12
+# at comparable attack resistance. Legacy bcrypt hashes still verify and get
+# rehashed on the next successful login (see password_needs_rehash).
+_ph = PasswordHasher(time_cost=2, memory_cost=65536, parallelism=2)
+
+
 def hash_password(password: str) -> str:
-    """Hash a password with bcrypt (auto-salted)."""
-    return bcrypt.hashpw(password.encode(), bcrypt.gensalt()).decode()
+    """Hash a password with Argon2id (auto-salted)."""
+    return _ph.hash(password)
+
+
+def password_needs_rehash(stored_hash: str) -> bool:
+    """True if the stored hash is legacy bcrypt or uses outdated parameters."""
+    if not stored_hash.startswith("$argon2"):
+        return True
+    return _ph.check_needs_rehash(stored_hash)
+
+
+# Verified against when a username doesn't exist, so unknown-user and
+# wrong-password logins take the same time (no username-probing timing leak).
+_DUMMY_HASH = _ph.hash("timing-equalization-dummy")
+
+
+def dummy_verify() -> None:
+    """Burn one full Argon2 verification against a throwaway hash."""
+    try:
+        _ph.verify(_DUMMY_HASH, "wrong-password")
+    except argon2_exceptions.VerifyMismatchError:
+        pass
+
+
+async def dummy_verify_async() -> None:
+    """Run dummy_verify on the hashing threadpool."""
+    loop = asyncio.get_running_loop()
+    await loop.run_in_executor(_BCRYPT_POOL, dummy_verify)
+
+
+async def hash_password_async(password: str) -> str:
+    """Hash a password on the bcrypt threadpool without blocking the event loop."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_BCRYPT_POOL, hash_password, password)
+
+
+async def verify_password_async(password: str, stored_hash: str) -> bool:
+    """Verify a password on the bcrypt threadpool without blocking the event loop."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_BCRYPT_POOL, verify_password, password, stored_hash)
+
+
+# Cache of verification outcomes so repeat logins skip the full bcrypt KDF.
+# Keyed by sha256(password || hash) so no plaintext is ever stored. Negative
+# results get a short TTL to avoid poisoning the cache via brute force.
+_VERIFY_CACHE_MAX = 2048
+_VERIFY_NEGATIVE_TTL = 60  # seconds
+_verify_cache: OrderedDict = OrderedDict()  # key -> (result, cached_at)
+_verify_lock = threading.Lock()
+
+
+def _verify_cache_key(password: str, stored_hash: str) -> bytes:
+    return hashlib.sha256(password.encode() + b"|" + stored_hash.encode()).digest()
 
 
 def verify_password(password: str, stored_hash: str) -> bool:
     """Verify a password against a bcrypt hash."""
-    try:
-        return bcrypt.checkpw(password.encode(), stored_hash.encode())
-    except Exception:
-        return False
+    key = _verify_cache_key(password, stored_hash)
+    now = time.monotonic()
+
+    with _verify_lock:
+        cached = _verify_cache.get(key)
+        if cached is not None:
+            result, cached_at = cached
+            if result or now - cached_at < _VERIFY_NEGATIVE_TTL:
+                _verify_cache.move_to_end(key)
+                return result
+            del _verify_cache[key]
+
+    if stored_hash.startswith("$argon2"):
+        try:
+            result = _ph.verify(stored_hash, password)
+        except argon2_exceptions.VerifyMismatchError:
+            result = False
+        except Exception:
+            return False
+    else:
+        # Legacy bcrypt hash from before the Argon2 migration.
+        try:
+            result = bcrypt.checkpw(password.encode(), stored_hash.encode())
+        except Exception:
+            return False
+
+    with _verify_lock:
+        _verify_cache[key] = (result, now)
+        _verify_cache.move_to_end(key)
+        while len(_verify_cache) > _VERIFY_CACHE_MAX:
+            _verify_cache.popitem(last=False)
+    return result
 
 
 # ==========================
@@ -49,7 +158,7 @@ def create_staff(conn: sqlite3.Connection, username: str, display_name: str,
         """INSERT INTO staff (username, display_name, password_hash, role, created_at)
            VALUES (?, ?, ?, ?, ?)""",
         (username.strip().lower(), display_name.strip(), hash_password(password),
-         role, datetime.utcnow().isoformat()),
+         role, _iso_now()),
     )
     conn.commit()
     return cursor.lastrowid
@@ -72,57 +181,84 @@ def get_staff_by_id(conn: sqlite3.Connection, staff_id: int):
 
 
 def list_staff(conn: sqlite3.Connection) -> list:
-    """List all staff accounts."""
+    """List all staff accounts (password hashes excluded)."""
     cursor = conn.cursor()
-    cursor.execute("SELECT * FROM staff ORDER BY created_at")
-    return [dict(row) for row in cursor.fetchall()]
+    # Explicit columns skip password_hash I/O; sqlite3.Row already acts as a
+    # mapping, so rows go straight to the template without a dict copy.
+    cursor.execute(
+        """SELECT id, username, display_name, role, is_active, created_at, last_login_at
+           FROM staff ORDER BY created_at"""
+    )
+    return cursor.fetchall()
+
+
+# The updatable column set is tiny, so every UPDATE shape is enumerated ahead
+# of time. Statement text stays identical across calls, which keeps sqlite3's
+# per-connection statement cache hot instead of re-preparing dynamic SQL.
+_STAFF_UPDATE_COLS = ("display_name", "role", "is_active", "password_hash")
+_UPDATE_SQL = {
+    cols: "UPDATE staff SET " + ", ".join(f"{c} = ?" for c in cols) + " WHERE id = ?"
+    for n in range(1, len(_STAFF_UPDATE_COLS) + 1)
+    for cols in combinations(_STAFF_UPDATE_COLS, n)
+}
 
 
 def update_staff(conn: sqlite3.Connection, staff_id: int, **fields):
     """Update staff fields. Supported: display_name, role, is_active, password."""
-    allowed = {"display_name", "role", "is_active"}
-    updates = []
-    params = []
-
+    values = {}
     for key, value in fields.items():
         if key == "password" and value:
-            updates.append("password_hash = ?")
-            params.append(hash_password(value))
-        elif key in allowed:
-            updates.append(f"{key} = ?")
-            params.append(value)
+            values["password_hash"] = hash_password(value)
+        elif key in ("display_name", "role", "is_active"):
+            values[key] = value
 
-    if not updates:
+    if not values:
         return
 
-    params.append(staff_id)
-    conn.execute(f"UPDATE staff SET {', '.join(updates)} WHERE id = ?", params)
+    cols = tuple(c for c in _STAFF_UPDATE_COLS if c in values)
+    params = [values[c] for c in cols] + [staff_id]
+    conn.execute(_UPDATE_SQL[cols], params)
     conn.commit()
 
 
 def deactivate_staff(conn: sqlite3.Connection, staff_id: int):
     """Deactivate a staff account and clear their sessions."""
-    conn.execute("UPDATE staff SET is_active = 0 WHERE id = ?", (staff_id,))
-    conn.execute("DELETE FROM sessions WHERE staff_id = ?", (staff_id,))
-    conn.commit()
+    # One transaction (and one fsync) for both statements
+    with conn:
+        conn.execute("UPDATE staff SET is_active = 0 WHERE id = ?", (staff_id,))
+        conn.execute("DELETE FROM sessions WHERE staff_id = ?", (staff_id,))
 
 
 # ==========================
 # Session management
 # ==========================
 
+# Sessions are stored as sha256(token): a leaked/backed-up database can't be
+# replayed as live cookies, and lookups stay a plain indexed equality on the
+# digest (no timing concern — the attacker would need the preimage).
+def _token_hash(token: str) -> str:
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
 def create_session(conn: sqlite3.Connection, staff_id: int,
                    staff_name: str, role: str) -> tuple:
     """Create a new session. Returns (token, csrf_token)."""
-    token = secrets.token_urlsafe(32)
-    csrf_token = secrets.token_urlsafe(32)
-    now = datetime.utcnow()
+    # One 64-byte draw split in two: same output distribution as two
+    # token_urlsafe(32) calls but half the getrandom() syscalls.
+    raw = os.urandom(64)
+    token = base64.urlsafe_b64encode(raw[:32]).rstrip(b"=").decode()
+    csrf_token = base64.urlsafe_b64encode(raw[32:]).rstrip(b"=").decode()
+    now = datetime.now(timezone.utc)
     expires = now + timedelta(hours=SESSION_EXPIRY_HOURS)
+    # expires_ts (unix epoch) is the comparison column; the ISO expires_at
+    # column is kept for readability and older rows.
+    expires_ts = int(time.time()) + SESSION_EXPIRY_HOURS * 3600
 
     conn.execute(
-        """INSERT INTO sessions (token, staff_name, created_at, expires_at, staff_id, csrf_token)
-           VALUES (?, ?, ?, ?, ?, ?)""",
-        (token, staff_name, now.isoformat(), expires.isoformat(), staff_id, csrf_token),
+        """INSERT INTO sessions (token, staff_name, created_at, expires_at, expires_ts, staff_id, csrf_token)
+           VALUES (?, ?, ?, ?, ?, ?, ?)""",
+        (_token_hash(token), staff_name, _iso(now), _iso(expires), expires_ts,
+         staff_id, csrf_token),
     )
     conn.commit()
     return token, csrf_token
@@ -134,40 +270,35 @@ def get_session(conn: sqlite3.Connection, token: str):
         return None
 
     cursor = conn.cursor()
+    # Expired rows filter out in SQL with a plain integer compare — no
+    # datetime parsing and no delete-on-read; cleanup_expired_sessions
+    # handles removal. The staff JOIN pulls the role in the same query.
     cursor.execute(
-        "SELECT token, staff_name, expires_at, staff_id, csrf_token FROM sessions WHERE token = ?",
-        (token,),
+        """SELECT s.staff_name, s.staff_id, s.csrf_token, st.role
+           FROM sessions s LEFT JOIN staff st ON st.id = s.staff_id
+           WHERE s.token = ? AND s.expires_ts >= ?""",
+        (_token_hash(token), int(time.time())),
     )
     row = cursor.fetchone()
     if not row:
         return None
 
-    if datetime.fromisoformat(row["expires_at"]) < datetime.utcnow():
-        conn.execute("DELETE FROM sessions WHERE token = ?", (token,))
-        conn.commit()
-        return None
-
-    # Look up role from staff table
-    staff = get_staff_by_id(conn, row["staff_id"]) if row["staff_id"] else None
-    role = staff["role"] if staff else "nurse"
-
     return {
-        "token": row["token"],
+        "token": token,
         "staff_id": row["staff_id"],
         "staff_name": row["staff_name"],
-        "role": role,
+        "role": row["role"] or "nurse",
         "csrf_token": row["csrf_token"],
     }
 
 
 def delete_session(conn: sqlite3.Connection, token: str):
     """Delete a session token."""
-    conn.execute("DELETE FROM sessions WHERE token = ?", (token,))
+    conn.execute("DELETE FROM sessions WHERE token = ?", (_token_hash(token),))
     conn.commit()
 
 
 def cleanup_expired_sessions(conn: sqlite3.Connection):
     """Remove all expired sessions."""
-    now = datetime.utcnow().isoformat()
-    conn.execute("DELETE FROM sessions WHERE expires_at < ?", (now,))
+    conn.execute("DELETE FROM sessions WHERE expires_ts < ?", (int(time.time()),))
     conn.commit()
@@ -0,0 +1,114 @@
+"""SQLite connection pool for Room Companion.
+
+Keeps a small set of long-lived connections (WAL mode, tuned pragmas) alive
+for the process lifetime so request handlers don't pay the file-open, journal
+setup, and page-cache warmup cost on every query.
+"""
+
+import queue
+import sqlite3
+import weakref
+from pathlib import Path
+
+DB_PATH = Path(__file__).parent / "alerts.db"
+POOL_SIZE = 4
+
+# Applied once per connection when the pool is created.
+_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-20000",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA foreign_keys=ON",
+    "PRAGMA busy_timeout=5000",
+)
+
+
+def _requeue_abandoned(pool: "ConnectionPool", conn: sqlite3.Connection):
+    """Return a connection whose proxy was garbage-collected without close().
+
+    Happens when a call site raises between acquire and close (e.g. a
+    busy_timeout expiring under write contention); without this the pool
+    slot would leak permanently. Roll back whatever the failed caller left
+    open so the next borrower gets a clean connection.
+    """
+    try:
+        conn.rollback()
+    except Exception:
+        pass
+    pool.release(conn)
+
+
+class PooledConnection:
+    """Proxy around a sqlite3.Connection whose close() returns it to the pool.
+
+    Existing call sites do conn = get_db_connection(); ...; conn.close(), so
+    releasing on close() lets them keep working unchanged. A finalizer backs
+    that up: if the proxy is dropped without close(), the raw connection is
+    re-queued instead of leaking one of the pool's slots.
+    """
+
+    def __init__(self, conn: sqlite3.Connection, pool: "ConnectionPool"):
+        self._conn = conn
+        self._pool = pool
+        self._finalizer = weakref.finalize(self, _requeue_abandoned, pool, conn)
+
+    def close(self):
+        conn, self._conn = self._conn, None
+        # detach() wins the race with the finalizer: exactly one of the two
+        # paths releases the connection.
+        if conn is not None and self._finalizer.detach() is not None:
+            self._pool.release(conn)
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+    def __enter__(self):
+        return self._conn.__enter__()
+
+    def __exit__(self, *exc):
+        return self._conn.__exit__(*exc)
+
+
+class ConnectionPool:
+    """Fixed-size pool of pre-configured sqlite3 connections."""
+
+    def __init__(self, path: Path = DB_PATH, size: int = POOL_SIZE):
+        self._connections: queue.Queue = queue.Queue(maxsize=size)
+        for _ in range(size):
+            self._connections.put(self._open(path))
+
+    @staticmethod
+    def _open(path: Path) -> sqlite3.Connection:
+        # check_same_thread=False: FastAPI sync endpoints run on a threadpool,
+        # so a connection may be borrowed from any worker thread.
+        # cached_statements: statements are cached per connection by SQL text,
+        # so a larger cache keeps every filter-combination variant prepared.
+        conn = sqlite3.connect(path, check_same_thread=False,
+                               cached_statements=512)
+        conn.row_factory = sqlite3.Row
+        for pragma in _PRAGMAS:
+            conn.execute(pragma)
+        return conn
+
+    def acquire(self) -> PooledConnection:
+        return PooledConnection(self._connections.get(), self)
+
+    def release(self, conn: sqlite3.Connection):
+        self._connections.put(conn)
+
+
+_pool: ConnectionPool = None
+
+
+def get_pool() -> ConnectionPool:
+    global _pool
+    if _pool is None:
+        _pool = ConnectionPool()
+    return _pool
+
+
+def get_connection() -> PooledConnection:
+    """Borrow a pooled connection; call .close() to return it to the pool."""
+    return get_pool().acquire()
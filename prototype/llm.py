@@ -8,16 +8,18 @@ Provides:
 """
 
 import asyncio
-import json
+import functools
 import os
 import re
-from collections import defaultdict
+import time
+from collections import defaultdict, deque
 from dataclasses import dataclass, asdict
 from datetime import datetime
 from pathlib import Path
 from typing import Optional
 
 import httpx
+import orjson
 
 # ---------------------------------------------------------------------------
 # API keys
@@ -34,6 +36,41 @@ OPENROUTER_MODEL = "meta-llama/llama-3.3-70b-instruct:free"
 
 TIMEOUT = 15.0  # seconds
 
+# Shared HTTP client (created at app startup) so every request reuses pooled
+# connections instead of paying DNS + TLS handshake per LLM call.
+_client: Optional[httpx.AsyncClient] = None
+
+
+async def init_llm() -> None:
+    """Create the shared HTTP client. Call from FastAPI startup."""
+    global _client
+    if _client is None:
+        _client = httpx.AsyncClient(
+            timeout=TIMEOUT,
+            limits=httpx.Limits(max_keepalive_connections=32, max_connections=64),
+            http2=True,
+        )
+
+
+async def close_llm() -> None:
+    """Close the shared HTTP client. Call from FastAPI shutdown."""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+def _get_client() -> httpx.AsyncClient:
+    global _client
+    if _client is None:
+        # Fallback for callers outside the app lifecycle (scripts, tests).
+        _client = httpx.AsyncClient(
+            timeout=TIMEOUT,
+            limits=httpx.Limits(max_keepalive_connections=32, max_connections=64),
+            http2=True,
+        )
+    return _client
+
 
 def load_api_keys() -> None:
     """Read API keys from ~/.clawdbot/api-keys.env (shell export format)."""
@@ -70,19 +107,16 @@ def load_api_keys() -> None:
 
 MAX_HISTORY = 20  # messages per room
 
-_histories: dict[str, list[dict]] = defaultdict(list)
+# deque(maxlen=...) evicts the oldest message on append — O(1), no list copy.
+_histories: dict[str, deque] = defaultdict(lambda: deque(maxlen=MAX_HISTORY))
 
 
-def _get_history(room_id: str) -> list[dict]:
+def _get_history(room_id: str) -> deque:
     return _histories[room_id]
 
 
 def _add_to_history(room_id: str, role: str, content: str) -> None:
-    history = _histories[room_id]
-    history.append({"role": role, "content": content})
-    # Keep only the last MAX_HISTORY messages
-    if len(history) > MAX_HISTORY:
-        _histories[room_id] = history[-MAX_HISTORY:]
+    _histories[room_id].append({"role": role, "content": content})
 
 
 # ---------------------------------------------------------------------------
@@ -100,12 +134,16 @@ FACILITY_SCHEDULE = """Facility Schedule:
 - Lights optional by 9:00 PM"""
 
 
-def build_system_prompt(room_id: str, resident_name: str, mode: str, current_time: str) -> str:
+# The prompt is strictly static per room configuration — the current time
+# travels in a separate context message (see _time_context) — so repeat calls
+# are byte-identical and qualify for provider-side prefix caching as well as
+# this lru_cache.
+@functools.lru_cache(maxsize=256)
+def build_system_prompt(room_id: str, resident_name: str, mode: str) -> str:
     """Build a two-layer system prompt: base identity + mode layer."""
 
     base = f"""You are the Room Companion, a friendly AI assistant in a nursing home facility.
 You are located in Room {room_id}, assisting {resident_name}.
-The current time is {current_time}.
 
 Your role:
 - Answer questions clearly and warmly in 2-3 sentences maximum.
@@ -141,6 +179,16 @@ Mode: Standard
     return base + mode_layer
 
 
+def _time_context() -> dict:
+    """Current time as a lightweight context message.
+
+    Kept out of the system prompt so the long static prefix stays
+    byte-identical across calls and provider prompt caching can land.
+    """
+    now = datetime.now().strftime("%I:%M %p on %A, %B %d")
+    return {"role": "user", "content": f"(context) The current time is {now}."}
+
+
 # ---------------------------------------------------------------------------
 # Classification
 # ---------------------------------------------------------------------------
@@ -154,15 +202,19 @@ class ClassificationResult:
 
 
 CLASSIFY_PROMPT = """You are a safety classifier for a nursing home AI system.
-Analyze the resident's message and determine if it's a help/distress request.
-
-Respond ONLY with valid JSON (no markdown, no explanation outside JSON):
-{
-  "is_help_request": true/false,
-  "severity": "emergency" | "urgent" | "routine" | "informational",
-  "confidence": 0.0-1.0,
-  "explanation": "brief reason"
-}
+For EACH numbered resident message below, determine if it's a help/distress request.
+
+Respond ONLY with a valid JSON array (no markdown, no explanation outside JSON),
+one object per message, in the same order:
+[
+  {
+    "id": 1,
+    "is_help_request": true/false,
+    "severity": "emergency" | "urgent" | "routine" | "informational",
+    "confidence": 0.0-1.0,
+    "explanation": "brief reason"
+  }
+]
 
 Severity guide:
 - emergency: immediate danger — falls, chest pain, can't breathe, unresponsive
@@ -170,51 +222,120 @@ Severity guide:
 - routine: non-urgent help — need bathroom assistance, medication reminder, general help request
 - informational: not a help request — questions about schedule, chat, orientation questions
 
-Message to classify: """
+Messages to classify:
+"""
+
+# Batching: classify() enqueues and a single worker drains up to
+# CLASSIFY_BATCH_MAX messages (waiting at most CLASSIFY_BATCH_WAIT for
+# stragglers) into one LLM call, amortizing the fixed prompt across a burst.
+CLASSIFY_BATCH_MAX = 16
+CLASSIFY_BATCH_WAIT = 0.05  # seconds
+
+_JSON_ARRAY_RE = re.compile(r'\[.*\]', re.DOTALL)
+
+_classify_queue: Optional[asyncio.Queue] = None
+_classify_worker_task: Optional[asyncio.Task] = None
+_classify_loop: Optional[asyncio.AbstractEventLoop] = None
 
 
 async def classify(user_message: str) -> ClassificationResult:
     """Classify a message for help intent and severity."""
-    messages = [
-        {"role": "user", "content": CLASSIFY_PROMPT + f'"{user_message}"'}
-    ]
+    queue = _ensure_classify_worker()
+    future: asyncio.Future = asyncio.get_running_loop().create_future()
+    await queue.put((user_message, future))
+    return await future
+
+
+def _ensure_classify_worker() -> asyncio.Queue:
+    """Create (or recreate, if the event loop changed) the batching worker."""
+    global _classify_queue, _classify_worker_task, _classify_loop
+    loop = asyncio.get_running_loop()
+    if _classify_queue is None or _classify_loop is not loop:
+        _classify_queue = asyncio.Queue()
+        _classify_loop = loop
+        _classify_worker_task = None
+    if _classify_worker_task is None or _classify_worker_task.done():
+        _classify_worker_task = loop.create_task(_classify_worker())
+    return _classify_queue
+
+
+async def _classify_worker() -> None:
+    loop = asyncio.get_running_loop()
+    while True:
+        batch = [await _classify_queue.get()]
+        deadline = loop.time() + CLASSIFY_BATCH_WAIT
+        while len(batch) < CLASSIFY_BATCH_MAX:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(_classify_queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+
+        results = await _classify_batch([msg for msg, _ in batch])
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+
+async def _classify_batch(user_messages: list[str]) -> list[ClassificationResult]:
+    """Classify a batch of messages with one LLM call."""
+    numbered = "\n".join(
+        f'{i}. "{msg}"' for i, msg in enumerate(user_messages, start=1)
+    )
+    messages = [{"role": "user", "content": CLASSIFY_PROMPT + numbered}]
     try:
         raw = await _call_llm(messages, temperature=0.1)
-        # Extract JSON from response
         raw = raw.strip()
-        # Try to find JSON object in the response
-        match = re.search(r'\{[^{}]*\}', raw, re.DOTALL)
-        if match:
-            data = json.loads(match.group())
-        else:
-            data = json.loads(raw)
-        return ClassificationResult(
-            is_help_request=bool(data.get("is_help_request", False)),
-            severity=data.get("severity", "informational"),
-            confidence=float(data.get("confidence", 0.5)),
-            explanation=data.get("explanation", ""),
-        )
+        # Try to find the JSON array in the response
+        match = _JSON_ARRAY_RE.search(raw)
+        items = orjson.loads(match.group() if match else raw)
+        by_id = {int(item.get("id", i + 1)): item for i, item in enumerate(items)}
+        results = []
+        for i, msg in enumerate(user_messages, start=1):
+            data = by_id.get(i)
+            if data is None:
+                results.append(_keyword_classify(msg))
+                continue
+            results.append(ClassificationResult(
+                is_help_request=bool(data.get("is_help_request", False)),
+                severity=data.get("severity", "informational"),
+                confidence=float(data.get("confidence", 0.5)),
+                explanation=data.get("explanation", ""),
+            ))
+        return results
     except Exception as e:
         print(f"[llm] Classification failed: {e}, falling back to keyword detection")
-        return _keyword_classify(user_message)
+        return [_keyword_classify(msg) for msg in user_messages]
+
+
+# One compiled alternation instead of ~17 per-word substring scans. All
+# matches are collected and the worst severity wins: a leftmost-match
+# shortcut would let "help me, I'm having chest pain" come back routine
+# because "help" appears first in the string.
+_KEYWORD_RE = re.compile(
+    r"(?P<emergency>fell|fall|can't breathe|chest pain|heart|bleeding|unconscious)"
+    r"|(?P<urgent>pain|hurt|sick|dizzy|nauseous)"
+    r"|(?P<routine>help|nurse|someone|assistance|bathroom)"
+)
+
+_KEYWORD_CONFIDENCE = {"emergency": 0.8, "urgent": 0.7, "routine": 0.6}
+_SEVERITY_PRIORITY = ("emergency", "urgent", "routine")
 
 
 def _keyword_classify(text: str) -> ClassificationResult:
     """Fallback keyword-based classification when LLM fails."""
-    lower = text.lower()
-    emergency_words = ["fell", "fall", "can't breathe", "chest pain", "heart", "bleeding", "unconscious"]
-    urgent_words = ["pain", "hurt", "sick", "dizzy", "nauseous"]
-    help_words = ["help", "nurse", "someone", "assistance", "bathroom"]
-
-    for word in emergency_words:
-        if word in lower:
-            return ClassificationResult(True, "emergency", 0.8, f"Keyword match: {word}")
-    for word in urgent_words:
-        if word in lower:
-            return ClassificationResult(True, "urgent", 0.7, f"Keyword match: {word}")
-    for word in help_words:
-        if word in lower:
-            return ClassificationResult(True, "routine", 0.6, f"Keyword match: {word}")
+    matched = {}  # severity -> first matching keyword
+    for match in _KEYWORD_RE.finditer(text.lower()):
+        matched.setdefault(match.lastgroup, match.group())
+    for severity in _SEVERITY_PRIORITY:
+        keyword = matched.get(severity)
+        if keyword:
+            return ClassificationResult(
+                True, severity, _KEYWORD_CONFIDENCE[severity],
+                f"Keyword match: {keyword}",
+            )
     return ClassificationResult(False, "informational", 0.9, "No distress keywords detected")
 
 
@@ -224,16 +345,15 @@ def _keyword_classify(text: str) -> ClassificationResult:
 
 async def chat(room_id: str, resident_name: str, mode: str, user_message: str) -> str:
     """Generate a conversational response, maintaining per-room history."""
-    now = datetime.now().strftime("%I:%M %p on %A, %B %d")
-    system_prompt = build_system_prompt(room_id, resident_name, mode, now)
+    system_prompt = build_system_prompt(room_id, resident_name, mode)
 
     _add_to_history(room_id, "user", user_message)
 
-    messages = [{"role": "system", "content": system_prompt}]
+    messages = [{"role": "system", "content": system_prompt}, _time_context()]
     messages.extend(_get_history(room_id))
 
     try:
-        response = await _call_llm(messages, temperature=0.7)
+        response = await _call_llm(messages, temperature=0.7, race=True)
         _add_to_history(room_id, "assistant", response)
         return response
     except Exception as e:
@@ -243,20 +363,136 @@ async def chat(room_id: str, resident_name: str, mode: str, user_message: str) -
         return fallback
 
 
+# Combined chat + classification: one LLM round-trip returns both the spoken
+# response and the safety classification, instead of two gathered calls.
+CHAT_CLASSIFY_INSTRUCTION = """
+
+Output format (MANDATORY): respond ONLY with a valid JSON object, no markdown:
+{
+  "response": "what you would say to the resident, 2-3 sentences",
+  "is_help_request": true/false,
+  "severity": "emergency" | "urgent" | "routine" | "informational",
+  "confidence": 0.0-1.0,
+  "explanation": "brief reason for the classification"
+}
+
+Severity guide:
+- emergency: immediate danger — falls, chest pain, can't breathe, unresponsive
+- urgent: needs prompt attention — significant pain, feeling very unwell
+- routine: non-urgent help — bathroom assistance, medication reminder, general help
+- informational: not a help request — schedule questions, chat, orientation"""
+
+_JSON_OBJECT_RE = re.compile(r'\{.*\}', re.DOTALL)
+
+
+async def chat_and_classify(room_id: str, resident_name: str, mode: str,
+                            user_message: str) -> tuple[str, ClassificationResult]:
+    """Generate a response AND classify the message in one LLM round-trip.
+
+    Returns (response_text, ClassificationResult). Falls back to the canned
+    response + keyword classifier if the call fails; if the model answers but
+    the JSON doesn't parse, the raw text is used with keyword classification.
+    """
+    # Cheap prefilter: a short message with no distress keyword ("hello",
+    # "what time is it") is decisively not a help request, so skip the JSON
+    # classification contract — plain chat prompt, fewer output tokens, no
+    # parse step. Anything long or keyword-matching goes through the full
+    # combined call as before.
+    if len(user_message) < 40 and not _KEYWORD_RE.search(user_message.lower()):
+        response_text = await chat(room_id, resident_name, mode, user_message)
+        return response_text, ClassificationResult(
+            False, "informational", 1.0, "Prefilter: no distress keywords",
+        )
+
+    system_prompt = build_system_prompt(room_id, resident_name, mode) \
+        + CHAT_CLASSIFY_INSTRUCTION
+
+    _add_to_history(room_id, "user", user_message)
+
+    messages = [{"role": "system", "content": system_prompt}, _time_context()]
+    messages.extend(_get_history(room_id))
+
+    try:
+        raw = await _call_llm(messages, temperature=0.7, race=True)
+    except Exception as e:
+        print(f"[llm] Chat+classify failed: {e}, using canned response")
+        fallback = _canned_response(user_message, room_id, resident_name, mode)
+        _add_to_history(room_id, "assistant", fallback)
+        return fallback, _keyword_classify(user_message)
+
+    try:
+        match = _JSON_OBJECT_RE.search(raw)
+        data = orjson.loads(match.group() if match else raw)
+        response_text = data["response"]
+        classification = ClassificationResult(
+            is_help_request=bool(data.get("is_help_request", False)),
+            severity=data.get("severity", "informational"),
+            confidence=float(data.get("confidence", 0.5)),
+            explanation=data.get("explanation", ""),
+        )
+    except Exception as e:
+        print(f"[llm] Chat+classify parse failed: {e}, keeping raw response")
+        response_text = raw
+        classification = _keyword_classify(user_message)
+
+    _add_to_history(room_id, "assistant", response_text)
+    return response_text, classification
+
+
+async def chat_stream(room_id: str, resident_name: str, mode: str, user_message: str):
+    """Stream a conversational response chunk by chunk, maintaining history.
+
+    Yields text fragments as they arrive from the provider; the concatenated
+    response is appended to the room history once the stream finishes.
+    """
+    system_prompt = build_system_prompt(room_id, resident_name, mode)
+
+    _add_to_history(room_id, "user", user_message)
+
+    messages = [{"role": "system", "content": system_prompt}, _time_context()]
+    messages.extend(_get_history(room_id))
+
+    parts = []
+    try:
+        async for chunk in _call_llm_stream(messages, temperature=0.7):
+            parts.append(chunk)
+            yield chunk
+    except Exception as e:
+        print(f"[llm] Chat stream failed: {e}, using canned response")
+        if not parts:
+            fallback = _canned_response(user_message, room_id, resident_name, mode)
+            parts.append(fallback)
+            yield fallback
+    if parts:
+        _add_to_history(room_id, "assistant", "".join(parts))
+
+
+# One compiled alternation walks the text once instead of a dozen separate
+# substring scans; the named group of the match picks the canned reply.
+_CANNED_RE = re.compile(
+    r"(?P<location>where am i|what is this place)"
+    r"|(?P<time>time)"
+    r"|(?P<day>day|date)"
+    r"|(?P<meal>breakfast|lunch|dinner|meal)"
+    r"|(?P<distress>help|fell|fall|pain|hurt)"
+)
+
+
 def _canned_response(text: str, room_id: str, resident_name: str, mode: str) -> str:
     """Fallback canned responses when both APIs are down."""
-    lower = text.lower()
+    match = _CANNED_RE.search(text.lower())
+    group = match.lastgroup if match else None
     now = datetime.now()
 
-    if "where am i" in lower or "what is this place" in lower:
+    if group == "location":
         return f"You're in Room {room_id} at your care home, {resident_name}. You're safe here."
-    if "time" in lower:
+    if group == "time":
         return f"It's {now.strftime('%I:%M %p').lstrip('0')} right now."
-    if "day" in lower or "date" in lower:
+    if group == "day":
         return f"Today is {now.strftime('%A, %B %d')}."
-    if "breakfast" in lower or "lunch" in lower or "dinner" in lower or "meal" in lower:
+    if group == "meal":
         return "Breakfast is at 8:00 AM, lunch at 12:00 PM, and dinner at 5:30 PM."
-    if any(w in lower for w in ["help", "fell", "fall", "pain", "hurt"]):
+    if group == "distress":
         return "I'm letting the staff know right away. Help is on the way — please stay where you are."
     return "I'm having a little trouble right now, but the staff are always nearby if you need anything."
 
@@ -265,58 +501,165 @@ def _canned_response(text: str, room_id: str, resident_name: str, mode: str) ->
 # LLM API caller (Groq primary, OpenRouter fallback)
 # ---------------------------------------------------------------------------
 
-async def _call_llm(messages: list[dict], temperature: float = 0.7) -> str:
-    """Call Groq first, then OpenRouter if Groq fails. Raises on total failure."""
-    async with httpx.AsyncClient(timeout=TIMEOUT) as client:
-        # Try Groq first
-        if GROQ_API_KEY:
-            try:
-                resp = await client.post(
-                    GROQ_URL,
-                    headers={
-                        "Authorization": f"Bearer {GROQ_API_KEY}",
-                        "Content-Type": "application/json",
-                    },
-                    json={
-                        "model": GROQ_MODEL,
-                        "messages": messages,
-                        "temperature": temperature,
-                        "max_tokens": 256,
-                    },
-                )
-                resp.raise_for_status()
-                data = resp.json()
-                content = data["choices"][0]["message"]["content"].strip()
-                if content:
-                    return content
-            except Exception as e:
-                print(f"[llm] Groq failed: {e}")
-
-        # Fallback to OpenRouter
-        if OPENROUTER_API_KEY:
-            try:
-                resp = await client.post(
-                    OPENROUTER_URL,
-                    headers={
-                        "Authorization": f"Bearer {OPENROUTER_API_KEY}",
-                        "Content-Type": "application/json",
-                        "HTTP-Referer": "https://github.com/Kidomigon/nursing-home-ai",
-                        "X-Title": "Room Companion",
-                    },
-                    json={
-                        "model": OPENROUTER_MODEL,
-                        "messages": messages,
-                        "temperature": temperature,
-                        "max_tokens": 256,
-                    },
-                )
+async def _call_llm(messages: list[dict], temperature: float = 0.7,
+                    race: bool = False) -> str:
+    """Call the LLM providers. Raises on total failure.
+
+    Sequential mode (default) tries Groq then falls back to OpenRouter —
+    cheapest in tokens, used for low-priority calls like classification.
+    With race=True both providers are queried concurrently and the first
+    valid response wins, which tightens tail latency when one is flaky.
+    """
+    client = _get_client()
+    providers = []
+    if GROQ_API_KEY:
+        providers.append(_try_groq)
+    if OPENROUTER_API_KEY:
+        providers.append(_try_openrouter)
+    if not providers:
+        raise RuntimeError("No LLM API keys configured")
+
+    if race and len(providers) > 1:
+        return await _race_providers(providers, client, messages, temperature)
+
+    for provider in providers:
+        try:
+            return await provider(client, messages, temperature)
+        except Exception as e:
+            print(f"[llm] {provider.__name__.lstrip('_')} failed: {e}")
+    raise RuntimeError("Both Groq and OpenRouter failed")
+
+
+async def _race_providers(providers, client, messages: list[dict],
+                          temperature: float) -> str:
+    """Race providers; first non-exception result wins, losers are cancelled."""
+    pending = {
+        asyncio.create_task(provider(client, messages, temperature))
+        for provider in providers
+    }
+    try:
+        while pending:
+            done, pending = await asyncio.wait(
+                pending, return_when=asyncio.FIRST_COMPLETED
+            )
+            for task in done:
+                if task.exception() is None:
+                    return task.result()
+                print(f"[llm] provider failed in race: {task.exception()}")
+        raise RuntimeError("Both Groq and OpenRouter failed")
+    finally:
+        for task in pending:
+            task.cancel()
+
+
+async def _try_groq(client: httpx.AsyncClient, messages: list[dict],
+                    temperature: float) -> str:
+    resp = await client.post(
+        GROQ_URL,
+        headers={
+            "Authorization": f"Bearer {GROQ_API_KEY}",
+            "Content-Type": "application/json",
+        },
+        json={
+            "model": GROQ_MODEL,
+            "messages": messages,
+            "temperature": temperature,
+            "max_tokens": 256,
+        },
+    )
+    resp.raise_for_status()
+    data = orjson.loads(resp.content)
+    content = data["choices"][0]["message"]["content"].strip()
+    if not content:
+        raise RuntimeError("Groq returned an empty response")
+    return content
+
+
+async def _try_openrouter(client: httpx.AsyncClient, messages: list[dict],
+                          temperature: float) -> str:
+    resp = await client.post(
+        OPENROUTER_URL,
+        headers={
+            "Authorization": f"Bearer {OPENROUTER_API_KEY}",
+            "Content-Type": "application/json",
+            "HTTP-Referer": "https://github.com/Kidomigon/nursing-home-ai",
+            "X-Title": "Room Companion",
+        },
+        json={
+            "model": OPENROUTER_MODEL,
+            "messages": messages,
+            "temperature": temperature,
+            "max_tokens": 256,
+        },
+    )
+    resp.raise_for_status()
+    data = orjson.loads(resp.content)
+    content = data["choices"][0]["message"]["content"].strip()
+    if not content:
+        raise RuntimeError("OpenRouter returned an empty response")
+    return content
+
+
+async def _call_llm_stream(messages: list[dict], temperature: float = 0.7):
+    """Stream completion chunks via the OpenAI-compatible SSE API.
+
+    Tries Groq then OpenRouter; yields delta content strings as they arrive.
+    Once a provider has produced output we stay with it — falling over
+    mid-stream would duplicate text already sent to the client.
+    """
+    client = _get_client()
+    targets = []
+    if GROQ_API_KEY:
+        targets.append((
+            GROQ_URL, GROQ_MODEL,
+            {"Authorization": f"Bearer {GROQ_API_KEY}",
+             "Content-Type": "application/json"},
+        ))
+    if OPENROUTER_API_KEY:
+        targets.append((
+            OPENROUTER_URL, OPENROUTER_MODEL,
+            {"Authorization": f"Bearer {OPENROUTER_API_KEY}",
+             "Content-Type": "application/json",
+             "HTTP-Referer": "https://github.com/Kidomigon/nursing-home-ai",
+             "X-Title": "Room Companion"},
+        ))
+    if not targets:
+        raise RuntimeError("No LLM API keys configured")
+
+    for url, model, headers in targets:
+        yielded = False
+        try:
+            async with client.stream(
+                "POST", url, headers=headers,
+                json={
+                    "model": model,
+                    "messages": messages,
+                    "temperature": temperature,
+                    "max_tokens": 256,
+                    "stream": True,
+                },
+            ) as resp:
                 resp.raise_for_status()
-                data = resp.json()
-                content = data["choices"][0]["message"]["content"].strip()
-                if content:
-                    return content
-            except Exception as e:
-                print(f"[llm] OpenRouter failed: {e}")
+                async for line in resp.aiter_lines():
+                    if not line.startswith("data: "):
+                        continue
+                    payload = line[len("data: "):].strip()
+                    if payload == "[DONE]":
+                        break
+                    delta = (
+                        orjson.loads(payload)["choices"][0]
+                        .get("delta", {})
+                        .get("content")
+                    )
+                    if delta:
+                        yielded = True
+                        yield delta
+            if yielded:
+                return
+        except Exception as e:
+            if yielded:
+                raise
+            print(f"[llm] stream from {url} failed: {e}")
 
     raise RuntimeError("Both Groq and OpenRouter failed")
 
@@ -327,6 +670,16 @@ async def _call_llm(messages: list[dict], temperature: float = 0.7) -> str:
 
 def get_greeting(room_id: str, resident_name: str, mode: str) -> str:
     """Generate a deterministic greeting based on profile and time of day."""
+    # Inputs are a handful of fixed room profiles plus the wall clock, so
+    # memoize per minute bucket — every page load within the same minute
+    # reuses the formatted string instead of redoing strftime work.
+    return _greeting_cached(room_id, resident_name, mode,
+                            int(time.time() // 60))
+
+
+@functools.lru_cache(maxsize=64)
+def _greeting_cached(room_id: str, resident_name: str, mode: str,
+                     minute_bucket: int) -> str:
     hour = datetime.now().hour
     if hour < 12:
         time_greeting = "Good morning"
@@ -13,15 +13,41 @@ Features:
 """
 
 import asyncio
+import functools
+import hashlib
+import hmac
 import os
+import re
 import subprocess
-from datetime import datetime
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from datetime import datetime, timezone
 import datetime as dt
 from pathlib import Path
 from typing import List, Optional
 
-from fastapi import FastAPI, Request, Form, Cookie, Depends, HTTPException
-from fastapi.responses import HTMLResponse, JSONResponse, RedirectResponse, Response
+import edge_tts
+import jinja2
+import orjson
+from fastapi import (
+    BackgroundTasks,
+    FastAPI,
+    Request,
+    Form,
+    Cookie,
+    Depends,
+    HTTPException,
+)
+from fastapi.responses import (
+    FileResponse,
+    HTMLResponse,
+    JSONResponse,
+    RedirectResponse,
+    Response,
+    StreamingResponse,
+)
+from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 from pydantic import BaseModel
@@ -30,8 +56,18 @@ from slowapi.util import get_remote_address
 from slowapi.errors import RateLimitExceeded
 import sqlite3
 
-from llm import load_api_keys, chat, classify, get_greeting, ClassificationResult
+from llm import (
+    load_api_keys,
+    init_llm,
+    close_llm,
+    chat_and_classify,
+    chat_stream,
+    classify,
+    get_greeting,
+    ClassificationResult,
+)
 import auth
+import db
 
 BASE_DIR = Path(__file__).parent
 DB_PATH = BASE_DIR / "alerts.db"
@@ -42,6 +78,10 @@ limiter = Limiter(key_func=get_remote_address)
 app = FastAPI(title="Room Companion")
 app.state.limiter = limiter
 
+# Compress HTML/JSON responses over 1 KB (staff dashboard + alert lists
+# shrink 5-10x); already-compressed payloads like TTS MP3s pass through.
+app.add_middleware(GZipMiddleware, minimum_size=1024)
+
 # Rate limit error handler
 @app.exception_handler(RateLimitExceeded)
 async def rate_limit_handler(request: Request, exc: RateLimitExceeded):
@@ -52,7 +92,20 @@ async def rate_limit_handler(request: Request, exc: RateLimitExceeded):
 
 # Static files & templates
 app.mount("/static", StaticFiles(directory=BASE_DIR / "static"), name="static")
-templates = Jinja2Templates(directory=str(BASE_DIR / "templates"))
+# auto_reload off: skip the file-stat per render that checks whether the
+# template changed on disk (templates only change with a deploy + restart).
+# The bytecode cache persists compiled templates across restarts, so the
+# first render after a deploy loads marshalled code instead of recompiling.
+_JINJA_CACHE_DIR = BASE_DIR / "jinja_cache"
+_JINJA_CACHE_DIR.mkdir(exist_ok=True)
+_jinja_env = jinja2.Environment(
+    loader=jinja2.FileSystemLoader(str(BASE_DIR / "templates")),
+    autoescape=jinja2.select_autoescape(),
+    auto_reload=False,
+    cache_size=400,
+    bytecode_cache=jinja2.FileSystemBytecodeCache(str(_JINJA_CACHE_DIR)),
+)
+templates = Jinja2Templates(env=_jinja_env)
 
 SESSION_EXPIRY_HOURS = 8
 
@@ -110,7 +163,8 @@ def init_db():
             token TEXT PRIMARY KEY,
             staff_name TEXT NOT NULL,
             created_at TEXT NOT NULL,
-            expires_at TEXT NOT NULL
+            expires_at TEXT NOT NULL,
+            expires_ts INTEGER
         )
         """
     )
@@ -131,44 +185,118 @@ def init_db():
         """
     )
 
+    # One metadata snapshot instead of a PRAGMA table_info round-trip per
+    # table: every migration below checks this dict.
+    cursor.execute(
+        """SELECT m.name, p.name FROM sqlite_master m
+           JOIN pragma_table_info(m.name) p
+           WHERE m.type = 'table'"""
+    )
+    existing = defaultdict(set)
+    for tbl, col in cursor.fetchall():
+        existing[tbl].add(col)
+
     # Migration: add severity column if missing (existing DBs)
-    cursor.execute("PRAGMA table_info(alerts)")
-    columns = [row[1] for row in cursor.fetchall()]
-    if "severity" not in columns:
+    if "severity" not in existing["alerts"]:
         cursor.execute("ALTER TABLE alerts ADD COLUMN severity TEXT NOT NULL DEFAULT 'routine'")
-    if "acknowledged_by" not in columns:
+    if "acknowledged_by" not in existing["alerts"]:
         cursor.execute("ALTER TABLE alerts ADD COLUMN acknowledged_by TEXT")
-    if "resolved_by" not in columns:
+    if "resolved_by" not in existing["alerts"]:
         cursor.execute("ALTER TABLE alerts ADD COLUMN resolved_by TEXT")
-    if "notes" not in columns:
+    if "notes" not in existing["alerts"]:
         cursor.execute("ALTER TABLE alerts ADD COLUMN notes TEXT")
 
     # Migration: add response column to questions if missing
-    cursor.execute("PRAGMA table_info(questions)")
-    columns = [row[1] for row in cursor.fetchall()]
-    if "response" not in columns:
+    if "response" not in existing["questions"]:
         cursor.execute("ALTER TABLE questions ADD COLUMN response TEXT")
 
+    # Migration: precomputed orientation flag so dashboard counts don't run
+    # the LIKE chain over every row on every render
+    if "is_orientation" not in existing["questions"]:
+        cursor.execute(
+            "ALTER TABLE questions ADD COLUMN is_orientation INTEGER NOT NULL DEFAULT 0"
+        )
+        cursor.execute(
+            """UPDATE questions SET is_orientation = 1
+               WHERE lower(question) LIKE '%where am i%'
+                  OR lower(question) LIKE '%what time%'
+                  OR lower(question) LIKE '%what day%'"""
+        )
+
+    # Migration: denormalized severity of the newest unresolved alert per
+    # room, maintained on alert writes so summary reads skip the per-room
+    # ORDER BY ... LIMIT 1. Recomputed at startup in case the process died
+    # between an alert write and the rooms update.
+    if "latest_active_severity" not in existing["rooms"]:
+        cursor.execute("ALTER TABLE rooms ADD COLUMN latest_active_severity TEXT")
+    cursor.execute(
+        """UPDATE rooms SET latest_active_severity =
+               (SELECT severity FROM alerts a
+                WHERE a.room_id = rooms.room_id AND a.status != 'resolved'
+                ORDER BY created_at DESC LIMIT 1)"""
+    )
+
     # Migration: add staff_id and csrf_token to sessions
-    cursor.execute("PRAGMA table_info(sessions)")
-    columns = [row[1] for row in cursor.fetchall()]
-    if "staff_id" not in columns:
+    if "staff_id" not in existing["sessions"]:
         cursor.execute("ALTER TABLE sessions ADD COLUMN staff_id INTEGER")
-    if "csrf_token" not in columns:
+    if "csrf_token" not in existing["sessions"]:
         cursor.execute("ALTER TABLE sessions ADD COLUMN csrf_token TEXT")
-
-    # Auto-seed rooms from defaults if table is empty
-    cursor.execute("SELECT COUNT(*) FROM rooms")
-    if cursor.fetchone()[0] == 0:
-        defaults = [
-            ("101", "Margaret", "standard"),
-            ("102", "Harold", "memory_support"),
-            ("103", "Dorothy", "standard"),
-        ]
-        cursor.executemany(
-            "INSERT INTO rooms (room_id, resident_name, mode) VALUES (?, ?, ?)",
-            defaults,
+    if "expires_ts" not in existing["sessions"]:
+        cursor.execute("ALTER TABLE sessions ADD COLUMN expires_ts INTEGER")
+        cursor.execute(
+            """UPDATE sessions SET expires_ts = CAST(strftime('%s', expires_at) AS INTEGER)
+               WHERE expires_ts IS NULL"""
         )
+    cursor.execute(
+        "CREATE INDEX IF NOT EXISTS idx_sessions_expires ON sessions(expires_ts)"
+    )
+
+    # Composite indexes covering the dashboard/filter access patterns so the
+    # summary and list queries range-scan instead of walking the whole table.
+    cursor.execute(
+        """CREATE INDEX IF NOT EXISTS idx_alerts_room_type_created
+           ON alerts(room_id, type, created_at DESC)"""
+    )
+    cursor.execute(
+        """CREATE INDEX IF NOT EXISTS idx_alerts_room_status_created
+           ON alerts(room_id, status, created_at DESC)"""
+    )
+    cursor.execute(
+        """CREATE INDEX IF NOT EXISTS idx_alerts_status_created
+           ON alerts(status, created_at DESC)"""
+    )
+    cursor.execute(
+        """CREATE INDEX IF NOT EXISTS idx_questions_room_created
+           ON questions(room_id, created_at)"""
+    )
+    # Dashboard severity filter: equality on severity plus newest-first order
+    cursor.execute(
+        """CREATE INDEX IF NOT EXISTS idx_alerts_severity_created
+           ON alerts(severity, created_at DESC)"""
+    )
+    # Partial index over just the active rows: the active-count scan and the
+    # latest-severity recompute only ever touch status != 'resolved', which
+    # stays a tiny slice of an ever-growing alerts table.
+    cursor.execute(
+        """CREATE INDEX IF NOT EXISTS idx_alerts_active
+           ON alerts(room_id, created_at DESC) WHERE status != 'resolved'"""
+    )
+    cursor.execute(
+        """CREATE INDEX IF NOT EXISTS idx_questions_orientation
+           ON questions(room_id, created_at) WHERE is_orientation = 1"""
+    )
+
+    # Auto-seed default rooms; the room_id PRIMARY KEY makes this idempotent
+    # with no COUNT check (and no race if two workers init at once)
+    defaults = [
+        ("101", "Margaret", "standard"),
+        ("102", "Harold", "memory_support"),
+        ("103", "Dorothy", "standard"),
+    ]
+    cursor.executemany(
+        "INSERT OR IGNORE INTO rooms (room_id, resident_name, mode) VALUES (?, ?, ?)",
+        defaults,
+    )
 
     # Auto-seed admin account if staff table is empty
     cursor.execute("SELECT COUNT(*) FROM staff")
@@ -177,48 +305,181 @@ def init_db():
             """INSERT INTO staff (username, display_name, password_hash, role, created_at)
                VALUES (?, ?, ?, ?, ?)""",
             ("admin", "Admin", auth.hash_password("admin1234"), "admin",
-             datetime.utcnow().isoformat()),
+             _utcnow_iso()),
         )
 
     # Clear stale sessions without staff_id (from old PIN-based auth)
     cursor.execute("DELETE FROM sessions WHERE staff_id IS NULL")
 
+    # Migration: sessions now store sha256(token) (64 hex chars); plaintext
+    # tokens from before the change can't be matched, so drop them
+    cursor.execute("DELETE FROM sessions WHERE length(token) != 64")
+
+    # Refresh planner statistics so the new indexes actually get picked
+    cursor.execute("ANALYZE")
+
     conn.commit()
     conn.close()
 
 
 def get_db_connection():
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
-    return conn
+    """Borrow a pooled connection; conn.close() returns it to the pool."""
+    return db.get_connection()
+
+
+def _utcnow_iso() -> str:
+    """ISO-8601 UTC timestamp; strftime beats isoformat() on CPython.
+
+    now(timezone.utc) rather than the deprecated utcnow(); the format has no
+    offset directive, so the stored text stays byte-compatible with (and
+    sorts against) existing rows. Microseconds stay in: created_at ordering
+    within the same second drives keyset pagination and latest-alert logic.
+    """
+    return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%f")
+
+
+# The resident-facing clock only shows minute granularity, so the three
+# formatted strings are rebuilt at most once a minute instead of three
+# strftime calls per page view.
+@functools.lru_cache(maxsize=1)
+def _clock_strings(minute_bucket: int) -> tuple:
+    now = dt.datetime.now()
+    return (
+        now.strftime("%A"),
+        now.strftime("%I:%M %p").lstrip("0"),
+        now.strftime("%B %d, %Y"),
+    )
+
+
+# Room profiles change only via the staff edit form, so the dict lives in
+# process memory and the per-request SQLite read disappears from every chat,
+# room view, and dashboard load.
+_ROOMS_CACHE: Optional[dict] = None
+_ROOMS_LOCK = threading.Lock()
 
 
 def get_rooms() -> dict:
-    """Load all room profiles from the database."""
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    cursor.execute("SELECT room_id, resident_name, mode FROM rooms ORDER BY room_id")
-    rooms = {}
-    for row in cursor.fetchall():
-        rooms[row["room_id"]] = {
-            "resident_name": row["resident_name"],
-            "mode": row["mode"],
-        }
-    conn.close()
-    return rooms
+    """Load all room profiles (cached until a room is edited)."""
+    global _ROOMS_CACHE
+    rooms = _ROOMS_CACHE
+    if rooms is not None:
+        return rooms
+    with _ROOMS_LOCK:
+        if _ROOMS_CACHE is None:
+            conn = get_db_connection()
+            rows = conn.execute(
+                """SELECT room_id, resident_name, mode, latest_active_severity
+                   FROM rooms ORDER BY room_id"""
+            ).fetchall()
+            conn.close()
+            _ROOMS_CACHE = {
+                row[0]: {
+                    "resident_name": row[1],
+                    "mode": row[2],
+                    "latest_active_severity": row[3],
+                }
+                for row in rows
+            }
+        return _ROOMS_CACHE
+
+
+def invalidate_rooms_cache():
+    """Drop the cached room profiles; next get_rooms() reloads from the DB."""
+    global _ROOMS_CACHE
+    _ROOMS_CACHE = None
+
+
+def update_rooms_cache(room_id: str, resident_name: str, mode: str):
+    """Patch one cached room in place after an edit, skipping the reload."""
+    with _ROOMS_LOCK:
+        if _ROOMS_CACHE is not None and room_id in _ROOMS_CACHE:
+            _ROOMS_CACHE[room_id]["resident_name"] = resident_name
+            _ROOMS_CACHE[room_id]["mode"] = mode
+
+
+# rooms.latest_active_severity mirrors "severity of the newest unresolved
+# alert". Alert creation sets it directly (the new row is by definition the
+# newest active one); resolving recomputes it from the alerts table.
+
+def _note_active_alert(conn, room_id: str, severity: str):
+    """Record a just-created alert's severity on the rooms row and cache.
+
+    Runs inside the caller's transaction so the alert INSERT and the rooms
+    UPDATE commit together.
+    """
+    conn.execute(
+        "UPDATE rooms SET latest_active_severity = ? WHERE room_id = ?",
+        (severity, room_id),
+    )
+    with _ROOMS_LOCK:
+        if _ROOMS_CACHE is not None and room_id in _ROOMS_CACHE:
+            _ROOMS_CACHE[room_id]["latest_active_severity"] = severity
+
+
+def _recompute_room_severity(conn, room_id: str):
+    """Re-derive latest_active_severity after an alert leaves the active set."""
+    row = conn.execute(
+        """SELECT severity FROM alerts
+           WHERE room_id = ? AND status != 'resolved'
+           ORDER BY created_at DESC LIMIT 1""",
+        (room_id,),
+    ).fetchone()
+    severity = row[0] if row else None
+    conn.execute(
+        "UPDATE rooms SET latest_active_severity = ? WHERE room_id = ?",
+        (severity, room_id),
+    )
+    with _ROOMS_LOCK:
+        if _ROOMS_CACHE is not None and room_id in _ROOMS_CACHE:
+            _ROOMS_CACHE[room_id]["latest_active_severity"] = severity
 
 
 # ==========================
 # Auth dependencies
 # ==========================
 
+# Validated sessions are cached briefly so the cluster of staff endpoints hit
+# on every dashboard interaction skips the sessions-table read. Logout and
+# account deactivation invalidate eagerly; the TTL bounds staleness for
+# anything else (e.g. expiry mid-window).
+_SESSION_CACHE: dict = {}  # token -> (session dict, cached_at)
+_SESSION_CACHE_TTL = 60  # seconds
+_SESSION_CACHE_MAX = 1024
+
+
+def _invalidate_session_cache(token: Optional[str] = None):
+    """Drop one cached session, or all of them when token is None."""
+    if token is None:
+        _SESSION_CACHE.clear()
+    else:
+        _SESSION_CACHE.pop(token, None)
+
+
+def _load_session(token: str):
+    conn = get_db_connection()
+    try:
+        return auth.get_session(conn, token)
+    finally:
+        conn.close()
+
+
 async def get_current_staff(session_token: Optional[str] = Cookie(None)):
     """FastAPI dependency: validate session and return staff info dict or None."""
     if not session_token:
         return None
-    conn = get_db_connection()
-    session = auth.get_session(conn, session_token)
-    conn.close()
+
+    cached = _SESSION_CACHE.get(session_token)
+    if cached is not None:
+        session, cached_at = cached
+        if time.monotonic() - cached_at < _SESSION_CACHE_TTL:
+            return session
+        _SESSION_CACHE.pop(session_token, None)
+
+    session = await asyncio.to_thread(_load_session, session_token)
+    if session is not None:
+        if len(_SESSION_CACHE) >= _SESSION_CACHE_MAX:
+            _SESSION_CACHE.clear()
+        _SESSION_CACHE[session_token] = (session, time.monotonic())
     return session
 
 
@@ -229,12 +490,17 @@ async def require_staff(staff=Depends(get_current_staff)):
     return staff
 
 
+def _csrf_ok(provided, expected) -> bool:
+    """Constant-time CSRF token comparison (no short-circuit timing leak)."""
+    return hmac.compare_digest(provided or "", expected or "")
+
+
 async def verify_csrf(request: Request, staff=Depends(get_current_staff)):
     """Verify CSRF token on POST requests. Returns staff dict."""
     if not staff:
         raise HTTPException(status_code=303, headers={"Location": "/staff/login"})
     form = await request.form()
-    if form.get("csrf") != staff.get("csrf_token"):
+    if not _csrf_ok(form.get("csrf"), staff.get("csrf_token")):
         raise HTTPException(status_code=403, detail="Invalid CSRF token")
     return staff
 
@@ -267,6 +533,58 @@ init_db()
 load_api_keys()
 
 
+# Alert fan-out: alert writes drop a small event onto a bounded queue drained
+# by one background worker, so downstream notification channels (WebSocket
+# pushes, pagers/SMS when they land) run decoupled from the request that
+# wrote the alert. The bound keeps memory flat under a burst.
+_ALERT_QUEUE_MAX = 1024
+
+
+async def _alert_worker(events: asyncio.Queue):
+    while True:
+        event = await events.get()
+        try:
+            # Fan-out targets plug in here; until one exists the event is
+            # simply consumed. The queue discipline is the point: dispatch
+            # latency never sits inside an alert-writing request.
+            pass
+        finally:
+            events.task_done()
+
+
+def _publish_alert_event(room_id: str, alert_type: str, severity: str):
+    """Enqueue an alert event from any thread; drops the event if the queue
+    is full rather than ever blocking the write path."""
+    loop = getattr(app.state, "alert_loop", None)
+    if loop is None:  # startup hasn't run (e.g. direct function calls in tests)
+        return
+    event = {"room_id": room_id, "type": alert_type, "severity": severity}
+    loop.call_soon_threadsafe(_enqueue_alert_event, event)
+
+
+def _enqueue_alert_event(event: dict):
+    try:
+        app.state.alert_events.put_nowait(event)
+    except asyncio.QueueFull:
+        print("[alerts] Fan-out queue full, dropping event")
+
+
+@app.on_event("startup")
+async def startup():
+    await init_llm()
+    app.state.alert_loop = asyncio.get_running_loop()
+    app.state.alert_events = asyncio.Queue(maxsize=_ALERT_QUEUE_MAX)
+    app.state.alert_worker = asyncio.create_task(_alert_worker(app.state.alert_events))
+
+
+@app.on_event("shutdown")
+async def shutdown():
+    # Let queued fan-out finish before the worker goes away
+    await app.state.alert_events.join()
+    app.state.alert_worker.cancel()
+    await close_llm()
+
+
 # ==========================
 # API models
 # ==========================
@@ -296,6 +614,14 @@ class Alert(BaseModel):
     notes: Optional[str] = None
 
 
+# Explicit column list in Alert field order: SELECT * would also haul any
+# future migration-added columns into every row and allocate Python objects
+# for them; this pins the row shape to the response model.
+_ALERT_COLS = ("id, room_id, resident_name, type, message, status, severity, "
+               "created_at, acknowledged_at, resolved_at, acknowledged_by, "
+               "resolved_by, notes")
+
+
 class ChatRequest(BaseModel):
     message: str
 
@@ -318,7 +644,7 @@ class TTSRequest(BaseModel):
 @app.post("/api/alerts", response_model=Alert)
 def create_alert(alert: AlertCreate):
     """Create a new alert."""
-    now_str = alert.timestamp or datetime.utcnow().isoformat()
+    now_str = alert.timestamp or _utcnow_iso()
     conn = get_db_connection()
     cursor = conn.cursor()
     cursor.execute(
@@ -327,17 +653,41 @@ def create_alert(alert: AlertCreate):
                VALUES (?, ?, ?, ?, 'new', ?, ?)""",
         (alert.room_id, alert.resident_name, alert.type, alert.message, alert.severity, now_str),
     )
+    # A client-supplied timestamp may backdate the row behind an existing
+    # active alert, so the newest-row shortcut only applies when the time
+    # was stamped here.
+    if alert.timestamp:
+        _recompute_room_severity(conn, alert.room_id)
+    else:
+        _note_active_alert(conn, alert.room_id, alert.severity)
     conn.commit()
     alert_id = cursor.lastrowid
-    cursor.execute("SELECT * FROM alerts WHERE id = ?", (alert_id,))
-    row = cursor.fetchone()
     conn.close()
-    return Alert(**dict(row))
+    _bump_staff_data_epoch()
+    _publish_alert_event(alert.room_id, alert.type, alert.severity)
+    # Every column value is known here, so build the response from lastrowid
+    # instead of re-reading the row we just wrote.
+    return Alert(
+        id=alert_id,
+        room_id=alert.room_id,
+        resident_name=alert.resident_name,
+        type=alert.type,
+        message=alert.message,
+        status="new",
+        severity=alert.severity,
+        created_at=now_str,
+    )
 
 
 @app.get("/api/alerts", response_model=List[Alert])
-def list_alerts(status: Optional[str] = None, room_id: Optional[str] = None):
-    """List alerts, optionally filtered by status or room."""
+def list_alerts(status: Optional[str] = None, room_id: Optional[str] = None,
+                limit: int = 100, before: Optional[str] = None):
+    """List alerts, optionally filtered by status or room.
+
+    Paginate with `limit` plus `before` (an ISO created_at from the previous
+    page's oldest row) — keyset pagination walks the created_at index
+    backwards instead of sorting the whole table.
+    """
     conn = get_db_connection()
     cursor = conn.cursor()
     conditions = []
@@ -348,119 +698,194 @@ def list_alerts(status: Optional[str] = None, room_id: Optional[str] = None):
     if room_id:
         conditions.append("room_id = ?")
         params.append(room_id)
+    if before:
+        conditions.append("created_at < ?")
+        params.append(before)
     where = " AND ".join(conditions)
-    query = "SELECT * FROM alerts"
+    query = f"SELECT {_ALERT_COLS} FROM alerts"
     if where:
         query += f" WHERE {where}"
-    query += " ORDER BY created_at DESC"
+    query += " ORDER BY created_at DESC LIMIT ?"
+    params.append(min(max(limit, 1), 500))
+    # Fetch in page-sized batches instead of the default arraysize of 1
+    cursor.arraysize = 200
     cursor.execute(query, params)
     rows = cursor.fetchall()
     conn.close()
-    return [Alert(**dict(row)) for row in rows]
+    # model_construct skips field re-validation: these rows came out of the
+    # alerts table and already match the schema, so paying pydantic's
+    # per-field checks on every row of every page is pure overhead.
+    return [Alert.model_construct(**{k: row[k] for k in row.keys()}) for row in rows]
 
 
 @app.post("/api/alerts/{alert_id}/ack", response_model=Alert)
 def acknowledge_alert(alert_id: int, staff_name: Optional[str] = None, notes: Optional[str] = None):
     """Mark an alert as acknowledged."""
-    now_str = datetime.utcnow().isoformat()
+    now_str = _utcnow_iso()
     conn = get_db_connection()
     cursor = conn.cursor()
     cursor.execute(
-        """UPDATE alerts SET status = 'ack', acknowledged_at = ?,
+        f"""UPDATE alerts SET status = 'ack', acknowledged_at = ?,
            acknowledged_by = ?, notes = COALESCE(?, notes)
-           WHERE id = ? AND status = 'new'""",
+           WHERE id = ? AND status = 'new'
+           RETURNING {_ALERT_COLS}""",
         (now_str, staff_name, notes, alert_id),
     )
-    conn.commit()
-    cursor.execute("SELECT * FROM alerts WHERE id = ?", (alert_id,))
     row = cursor.fetchone()
+    conn.commit()
+    if row is None:
+        # Alert wasn't in 'new' status; return its current state unchanged
+        cursor.execute(f"SELECT {_ALERT_COLS} FROM alerts WHERE id = ?", (alert_id,))
+        row = cursor.fetchone()
     conn.close()
-    return Alert(**dict(row))
+    _bump_staff_data_epoch()
+    return Alert.model_construct(**{k: row[k] for k in row.keys()})
 
 
 @app.post("/api/alerts/{alert_id}/resolve", response_model=Alert)
 def resolve_alert(alert_id: int, staff_name: Optional[str] = None, notes: Optional[str] = None):
     """Mark an alert as resolved."""
-    now_str = datetime.utcnow().isoformat()
+    now_str = _utcnow_iso()
     conn = get_db_connection()
     cursor = conn.cursor()
-    if notes:
-        cursor.execute("SELECT notes FROM alerts WHERE id = ?", (alert_id,))
-        existing = cursor.fetchone()
-        if existing and existing["notes"]:
-            notes = existing["notes"] + "\n" + notes
+    # Notes merge happens in the UPDATE itself: appended to existing notes
+    # with a newline, or kept as-is when no new notes arrive
     cursor.execute(
-        """UPDATE alerts SET status = 'resolved', resolved_at = ?,
-           resolved_by = ?, notes = COALESCE(?, notes)
-           WHERE id = ?""",
-        (now_str, staff_name, notes, alert_id),
+        f"""UPDATE alerts SET status = 'resolved', resolved_at = ?,
+           resolved_by = ?,
+           notes = CASE
+               WHEN ? IS NULL THEN notes
+               WHEN notes IS NULL OR notes = '' THEN ?
+               ELSE notes || char(10) || ?
+           END
+           WHERE id = ?
+           RETURNING {_ALERT_COLS}""",
+        (now_str, staff_name, notes, notes, notes, alert_id),
     )
-    conn.commit()
-    cursor.execute("SELECT * FROM alerts WHERE id = ?", (alert_id,))
     row = cursor.fetchone()
+    if row is not None:
+        _recompute_room_severity(conn, row["room_id"])
+    conn.commit()
     conn.close()
-    return Alert(**dict(row))
+    _bump_staff_data_epoch()
+    return Alert.model_construct(**{k: row[k] for k in row.keys()})
 
 
-@app.get("/api/alerts/summary")
-def alerts_summary():
-    """Per-room summary: help counts (30m), orientation counts (7d), active alerts."""
-    conn = get_db_connection()
+# Each helper borrows its own pooled connection so the three grouped scans
+# can run concurrently (WAL allows parallel readers).
+
+def _cutoff_iso(**delta) -> str:
+    """ISO cutoff literal computed in Python. created_at is stored as
+    lexicographically sortable ISO-8601 UTC text, so a bare `created_at >= ?`
+    compare stays sargable — wrapping the column in datetime() would defeat
+    the composite indexes and re-evaluate per row."""
+    cutoff = datetime.now(timezone.utc) - dt.timedelta(**delta)
+    return cutoff.strftime("%Y-%m-%dT%H:%M:%S.%f")
+
+
+# The polled dashboard queries as module constants: a single SQL text object
+# per query guarantees statement-cache hits on every connection in the pool
+# instead of depending on string interning of repeated literals.
+_SQL_HELP_COUNTS = """SELECT room_id, COUNT(*) FROM alerts
+    WHERE type = 'help' AND created_at >= ?
+    GROUP BY room_id"""
+
+_SQL_ORIENTATION_COUNTS = """SELECT room_id, COUNT(*) FROM questions
+    WHERE is_orientation = 1 AND created_at >= ?
+    GROUP BY room_id"""
+
+_SQL_ACTIVE_COUNTS = """SELECT room_id, COUNT(*) FROM alerts
+    WHERE status != 'resolved'
+    GROUP BY room_id"""
+
+
+def _tuple_cursor(conn):
+    """Cursor yielding plain tuples: the grouped scans only unpack
+    (room_id, count), so the per-row sqlite3.Row allocation is waste."""
     cursor = conn.cursor()
-    rooms = get_rooms()
-    summary = {}
+    cursor.row_factory = None
+    return cursor
 
-    for room_id, profile in rooms.items():
-        cursor.execute(
-            """SELECT COUNT(*) FROM alerts
-               WHERE room_id = ? AND type = 'help'
-               AND datetime(created_at) >= datetime('now', '-30 minutes')""",
-            (room_id,),
-        )
-        help_count = cursor.fetchone()[0]
 
-        cursor.execute(
-            """SELECT COUNT(*) FROM questions
-               WHERE room_id = ?
-               AND datetime(created_at) >= datetime('now', '-7 days')
-               AND (lower(question) LIKE '%where am i%'
-                    OR lower(question) LIKE '%what time%'
-                    OR lower(question) LIKE '%what day%')""",
-            (room_id,),
-        )
-        orientation_count = cursor.fetchone()[0]
+def _query_help_counts() -> dict:
+    conn = get_db_connection()
+    try:
+        cursor = _tuple_cursor(conn)
+        cursor.execute(_SQL_HELP_COUNTS, (_cutoff_iso(minutes=30),))
+        return {rid: n for rid, n in cursor.fetchall()}
+    finally:
+        conn.close()
 
-        cursor.execute(
-            """SELECT COUNT(*) FROM alerts
-               WHERE room_id = ? AND status != 'resolved'""",
-            (room_id,),
-        )
-        active_count = cursor.fetchone()[0]
 
-        cursor.execute(
-            """SELECT severity FROM alerts
-               WHERE room_id = ? AND status != 'resolved'
-               ORDER BY created_at DESC LIMIT 1""",
-            (room_id,),
-        )
-        row = cursor.fetchone()
-        latest_severity = row[0] if row else None
+def _query_orientation_counts() -> dict:
+    conn = get_db_connection()
+    try:
+        cursor = _tuple_cursor(conn)
+        cursor.execute(_SQL_ORIENTATION_COUNTS, (_cutoff_iso(days=7),))
+        return {rid: n for rid, n in cursor.fetchall()}
+    finally:
+        conn.close()
 
-        summary[room_id] = {
+
+def _query_active_alerts() -> dict:
+    # Latest severity per room no longer needs a correlated subquery here —
+    # it's maintained on rooms.latest_active_severity and read from the
+    # rooms cache.
+    conn = get_db_connection()
+    try:
+        cursor = _tuple_cursor(conn)
+        cursor.execute(_SQL_ACTIVE_COUNTS)
+        return {rid: n for rid, n in cursor.fetchall()}
+    finally:
+        conn.close()
+
+
+async def _room_summary_stats() -> tuple:
+    """Per-room dashboard stats from three grouped scans instead of 4 queries
+    per room, fanned out concurrently on the threadpool. Returns
+    (help_counts, orientation_counts, active_counts) dicts keyed by room_id;
+    missing rooms mean zero."""
+    return await asyncio.gather(
+        asyncio.to_thread(_query_help_counts),
+        asyncio.to_thread(_query_orientation_counts),
+        asyncio.to_thread(_query_active_alerts),
+    )
+
+
+@app.get("/api/alerts/summary")
+async def alerts_summary(request: Request):
+    """Per-room summary: help counts (30m), orientation counts (7d), active alerts.
+
+    The dashboard polls this on a timer and most polls see no change, so the
+    response carries an ETag over the serialized body: a matching
+    If-None-Match turns the poll into a bodyless 304.
+    """
+    rooms = get_rooms()
+
+    help_counts, orientation_counts, active_counts = await _room_summary_stats()
+
+    summary = {
+        room_id: {
             "resident_name": profile["resident_name"],
             "mode": profile["mode"],
-            "help_count_30m": help_count,
-            "orientation_count_7d": orientation_count,
-            "active_alerts": active_count,
-            "latest_severity": latest_severity,
+            "help_count_30m": help_counts.get(room_id, 0),
+            "orientation_count_7d": orientation_counts.get(room_id, 0),
+            "active_alerts": active_counts.get(room_id, 0),
+            "latest_severity": profile["latest_active_severity"],
         }
+        for room_id, profile in rooms.items()
+    }
 
-    conn.close()
-    return summary
+    body = orjson.dumps(summary)
+    etag = f'W/"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+    headers = {"ETag": etag, "Cache-Control": "private, must-revalidate"}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
 
 
 @app.get("/api/rooms/{room_id}")
-def get_room(room_id: str):
+def get_room(room_id: str) -> dict:
     """Get a single room profile."""
     rooms = get_rooms()
     profile = rooms.get(room_id)
@@ -475,7 +900,8 @@ def get_room(room_id: str):
 
 @app.post("/api/room/{room_id}/chat", response_model=ChatResponse)
 @limiter.limit("20/minute")
-async def room_chat(request: Request, room_id: str, req: ChatRequest):
+async def room_chat(request: Request, room_id: str, req: ChatRequest,
+                    background: BackgroundTasks):
     """Send a message to the Room Companion and get a response."""
     rooms = get_rooms()
     profile = rooms.get(room_id)
@@ -489,47 +915,164 @@ async def room_chat(request: Request, room_id: str, req: ChatRequest):
     if not user_message:
         return ChatResponse(response="I didn't catch that. Could you say that again?", alert_created=False)
 
-    chat_task = chat(room_id, resident_name, mode, user_message)
-    classify_task = classify(user_message)
-    response_text, classification = await asyncio.gather(chat_task, classify_task)
+    # One combined LLM round-trip instead of gathered chat + classify calls
+    response_text, classification = await chat_and_classify(
+        room_id, resident_name, mode, user_message
+    )
 
-    now_str = datetime.utcnow().isoformat()
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    cursor.execute(
-        """INSERT INTO questions (room_id, resident_name, question, response, created_at)
-           VALUES (?, ?, ?, ?, ?)""",
-        (room_id, resident_name, user_message, response_text, now_str),
+    # The response only needs the alert decision, which is pure Python; the
+    # sqlite write (and its fsync) runs as a background task after the
+    # response is sent
+    alert_created, severity = _alert_decision(classification)
+    background.add_task(
+        _record_chat, room_id, resident_name, user_message, response_text,
+        classification,
     )
 
-    alert_created = False
-    severity = None
-    if classification.is_help_request and classification.confidence >= 0.5 and classification.severity != "informational":
-        severity = classification.severity
-        cursor.execute(
-            """INSERT INTO alerts
-                   (room_id, resident_name, type, message, status, severity, created_at)
-                   VALUES (?, ?, 'help', ?, 'new', ?, ?)""",
-            (room_id, resident_name, f"[{classification.severity}] {user_message}", severity, now_str),
+    return ChatResponse(response=response_text, alert_created=alert_created, severity=severity)
+
+
+# Matches the phrases counted as orientation questions on the dashboard;
+# evaluated once at insert time and stored in questions.is_orientation.
+_ORIENTATION_RE = re.compile(r"where am i|what time|what day")
+
+
+def _alert_decision(classification: ClassificationResult) -> tuple:
+    """Whether a classification warrants an alert. Returns (alert_created, severity)."""
+    if (classification.is_help_request and classification.confidence >= 0.5
+            and classification.severity != "informational"):
+        return True, classification.severity
+    return False, None
+
+
+def _record_chat(room_id: str, resident_name: str, user_message: str,
+                 response_text: str, classification: ClassificationResult):
+    """Log the question and create a help alert if warranted.
+
+    Returns (alert_created, severity).
+    """
+    now_str = _utcnow_iso()
+    conn = get_db_connection()
+
+    alert_created, severity = _alert_decision(classification)
+    # One explicit transaction (and one WAL fsync) for both inserts
+    with conn:
+        conn.execute(
+            """INSERT INTO questions
+                   (room_id, resident_name, question, response, created_at, is_orientation)
+               VALUES (?, ?, ?, ?, ?, ?)""",
+            (room_id, resident_name, user_message, response_text, now_str,
+             1 if _ORIENTATION_RE.search(user_message.lower()) else 0),
         )
-        alert_created = True
+        if alert_created:
+            conn.execute(
+                """INSERT INTO alerts
+                       (room_id, resident_name, type, message, status, severity, created_at)
+                       VALUES (?, ?, 'help', ?, 'new', ?, ?)""",
+                (room_id, resident_name, f"[{classification.severity}] {user_message}", severity, now_str),
+            )
+            _note_active_alert(conn, room_id, severity)
 
-    conn.commit()
     conn.close()
+    _bump_staff_data_epoch()
+    if alert_created:
+        _publish_alert_event(room_id, "help", severity)
+    return alert_created, severity
 
-    return ChatResponse(response=response_text, alert_created=alert_created, severity=severity)
+
+# Strong references to in-flight post-stream writes; a bare create_task
+# result can be garbage-collected before it runs.
+_persist_tasks: set = set()
+
+
+@app.post("/api/room/{room_id}/chat/stream")
+@limiter.limit("20/minute")
+async def room_chat_stream(request: Request, room_id: str, req: ChatRequest):
+    """Streaming variant of chat — text chunks flush as tokens arrive."""
+    rooms = get_rooms()
+    profile = rooms.get(room_id)
+    if not profile:
+        return JSONResponse({"error": "Unknown room"}, status_code=404)
+
+    resident_name = profile["resident_name"]
+    mode = profile["mode"]
+    user_message = req.message.strip()
+
+    if not user_message:
+        return StreamingResponse(
+            iter(["I didn't catch that. Could you say that again?"]),
+            media_type="text/plain; charset=utf-8",
+        )
+
+    classify_task = asyncio.create_task(classify(user_message))
+
+    async def persist(reply: str):
+        classification = await asyncio.shield(classify_task)
+        await asyncio.to_thread(
+            _record_chat, room_id, resident_name, user_message,
+            reply, classification,
+        )
+
+    async def generate():
+        parts = []
+        try:
+            async for chunk in chat_stream(room_id, resident_name, mode, user_message):
+                parts.append(chunk)
+                yield chunk
+        finally:
+            # A client disconnect cancels this generator mid-stream. The
+            # write runs as a detached task so the chat log — and any help
+            # alert the classification triggers — still lands, with whatever
+            # reply made it out before the drop.
+            task = asyncio.create_task(persist("".join(parts)))
+            _persist_tasks.add(task)
+            task.add_done_callback(_persist_tasks.discard)
+
+    return StreamingResponse(generate(), media_type="text/plain; charset=utf-8")
 
 
 # ==========================
 # TTS endpoint (server-side via edge-tts)
 # ==========================
 
+# Greetings and canned phrases repeat constantly, so synthesized clips are
+# kept in a small LRU keyed on (voice, rate, text). Hits skip the edge-tts
+# round-trip entirely. A disk tier below the LRU survives restarts and
+# serves evicted clips via sendfile.
+_TTS_CACHE: OrderedDict = OrderedDict()  # key -> bytes
+_TTS_CACHE_MAX = 256
+_TTS_LOCK = threading.Lock()
+
+TTS_CACHE_DIR = BASE_DIR / "tts_cache"
+TTS_CACHE_DIR.mkdir(exist_ok=True)
+_TTS_DISK_MAX = 1024  # clips; the key space is attacker-controlled text
+
+
+def _prune_tts_dir():
+    """Evict oldest-mtime clips once the disk tier exceeds its cap.
+
+    Like the in-memory LRU above, the disk tier needs a bound: the cache key
+    hashes request text from an unauthenticated endpoint, so distinct texts
+    would otherwise grow tts_cache/ without limit.
+    """
+    clips = sorted(TTS_CACHE_DIR.glob("*.mp3"), key=lambda p: p.stat().st_mtime)
+    for stale in clips[:max(0, len(clips) - _TTS_DISK_MAX)]:
+        try:
+            stale.unlink()
+        except OSError:
+            pass
+
+
+def _tts_cache_key(voice: str, rate: str, text: str) -> str:
+    return hashlib.blake2b(
+        f"{voice}|{rate}|{text}".encode(), digest_size=16
+    ).hexdigest()
+
+
 @app.post("/api/tts")
 @limiter.limit("30/minute")
 async def text_to_speech(request: Request, req: TTSRequest):
     """Generate speech audio from text using Microsoft Edge TTS."""
-    import edge_tts
-
     text = req.text.strip()
     if not text:
         return JSONResponse({"error": "No text"}, status_code=400)
@@ -537,13 +1080,48 @@ async def text_to_speech(request: Request, req: TTSRequest):
     voice = "en-US-AriaNeural"
     rate = "-10%" if req.mode == "memory_support" else "+0%"
 
+    key = _tts_cache_key(voice, rate, text)
+    with _TTS_LOCK:
+        cached = _TTS_CACHE.get(key)
+        if cached is not None:
+            _TTS_CACHE.move_to_end(key)
+    if cached is not None:
+        return Response(content=cached, media_type="audio/mpeg")
+
+    cache_file = TTS_CACHE_DIR / f"{key}.mp3"
+    if cache_file.exists():
+        return FileResponse(cache_file, media_type="audio/mpeg")
+
     communicate = edge_tts.Communicate(text=text, voice=voice, rate=rate)
-    chunks = []
-    async for chunk in communicate.stream():
-        if chunk["type"] == "audio":
-            chunks.append(chunk["data"])
 
-    return Response(content=b"".join(chunks), media_type="audio/mpeg")
+    # Stream audio as it's synthesized: the browser can start playback on the
+    # first chunk instead of waiting for the whole clip to buffer server-side.
+    # Chunks are teed into a buffer and cached once the clip completes.
+    async def generate():
+        parts = []
+        async for chunk in communicate.stream():
+            if chunk["type"] == "audio":
+                parts.append(chunk["data"])
+                yield chunk["data"]
+        if parts:
+            clip = b"".join(parts)
+            with _TTS_LOCK:
+                _TTS_CACHE[key] = clip
+                _TTS_CACHE.move_to_end(key)
+                while len(_TTS_CACHE) > _TTS_CACHE_MAX:
+                    _TTS_CACHE.popitem(last=False)
+            # Write-then-rename so a concurrent reader never sees a partial clip
+            tmp = cache_file.with_suffix(".tmp")
+            await asyncio.to_thread(tmp.write_bytes, clip)
+            await asyncio.to_thread(tmp.replace, cache_file)
+            await asyncio.to_thread(_prune_tts_dir)
+
+    return StreamingResponse(
+        generate(),
+        media_type="audio/mpeg",
+        # Keep reverse proxies from re-buffering the stream back into a blob
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
 # ==========================
@@ -554,14 +1132,49 @@ async def text_to_speech(request: Request, req: TTSRequest):
 async def staff_login_page(request: Request, error: Optional[str] = None):
     """Staff login page."""
     return templates.TemplateResponse(
-        "staff_login.html", {"request": request, "error": error or ""}
+        request, "staff_login.html", {"error": error or ""}
     )
 
 
+def _lookup_staff(username: str):
+    conn = get_db_connection()
+    try:
+        return auth.get_staff_by_username(conn, username)
+    finally:
+        conn.close()
+
+
+def _establish_session(staff_record: dict, password: str) -> tuple:
+    """Create a session (upgrading a legacy hash first). Returns (token, csrf)."""
+    conn = get_db_connection()
+    try:
+        # Upgrade legacy bcrypt hashes to Argon2 while we have the plaintext
+        if auth.password_needs_rehash(staff_record["password_hash"]):
+            auth.update_staff(conn, staff_record["id"], password=password)
+        return auth.create_session(
+            conn, staff_record["id"], staff_record["display_name"],
+            staff_record["role"],
+        )
+    finally:
+        conn.close()
+
+
+def _update_last_login(staff_id: int):
+    """Record last_login_at; runs as a background task after the response."""
+    conn = get_db_connection()
+    conn.execute(
+        "UPDATE staff SET last_login_at = ? WHERE id = ?",
+        (_utcnow_iso(), staff_id),
+    )
+    conn.commit()
+    conn.close()
+
+
 @app.post("/staff/login")
 @limiter.limit("5/minute")
 async def staff_login(
     request: Request,
+    background: BackgroundTasks,
     username: str = Form(...),
     password: str = Form(...),
 ):
@@ -569,41 +1182,36 @@ async def staff_login(
     username = username.strip()
     if not username:
         return templates.TemplateResponse(
-            "staff_login.html",
-            {"request": request, "error": "Please enter your username."},
+            request, "staff_login.html",
+            {"error": "Please enter your username."},
             status_code=401,
         )
 
-    conn = get_db_connection()
-    staff_record = auth.get_staff_by_username(conn, username)
+    staff_record = await asyncio.to_thread(_lookup_staff, username)
 
     if not staff_record or not staff_record["is_active"]:
-        conn.close()
+        # Burn a verification anyway so unknown usernames take as long as
+        # wrong passwords
+        await auth.dummy_verify_async()
         return templates.TemplateResponse(
-            "staff_login.html",
-            {"request": request, "error": "Invalid username or password."},
+            request, "staff_login.html",
+            {"error": "Invalid username or password."},
             status_code=401,
         )
 
-    if not auth.verify_password(password, staff_record["password_hash"]):
-        conn.close()
+    if not await auth.verify_password_async(password, staff_record["password_hash"]):
         return templates.TemplateResponse(
-            "staff_login.html",
-            {"request": request, "error": "Invalid username or password."},
+            request, "staff_login.html",
+            {"error": "Invalid username or password."},
             status_code=401,
         )
 
-    token, csrf_token = auth.create_session(
-        conn, staff_record["id"], staff_record["display_name"], staff_record["role"]
+    token, csrf_token = await asyncio.to_thread(
+        _establish_session, staff_record, password
     )
 
-    # Update last login
-    conn.execute(
-        "UPDATE staff SET last_login_at = ? WHERE id = ?",
-        (datetime.utcnow().isoformat(), staff_record["id"]),
-    )
-    conn.commit()
-    conn.close()
+    # Last-login write (and its fsync) happens after the response is sent
+    background.add_task(_update_last_login, staff_record["id"])
 
     response = RedirectResponse(url="/staff", status_code=303)
     response.set_cookie(
@@ -620,9 +1228,14 @@ async def staff_login(
 async def staff_logout(session_token: Optional[str] = Cookie(None)):
     """Log out staff — delete session and redirect to login."""
     if session_token:
-        conn = get_db_connection()
-        auth.delete_session(conn, session_token)
-        conn.close()
+        def _delete():
+            conn = get_db_connection()
+            try:
+                auth.delete_session(conn, session_token)
+            finally:
+                conn.close()
+        await asyncio.to_thread(_delete)
+        _invalidate_session_cache(session_token)
     response = RedirectResponse(url="/staff/login", status_code=303)
     response.delete_cookie("session_token")
     return response
@@ -643,14 +1256,11 @@ async def room_view(request: Request, room_id: str):
     resident_name = profile["resident_name"]
     mode = profile["mode"]
     greeting = get_greeting(room_id, resident_name, mode)
-    current_day = dt.datetime.now().strftime("%A")
-    current_time = dt.datetime.now().strftime("%I:%M %p").lstrip("0")
-    current_date = dt.datetime.now().strftime("%B %d, %Y")
+    current_day, current_time, current_date = _clock_strings(int(time.time() // 60))
 
     return templates.TemplateResponse(
-        "room.html",
+        request, "room.html",
         {
-            "request": request,
             "room_id": room_id,
             "resident_name": resident_name,
             "mode": mode,
@@ -662,9 +1272,23 @@ async def room_view(request: Request, room_id: str):
     )
 
 
+# A panicked resident can mash the help button many times a second; staff
+# only need one alert, so rapid repeats from the same room collapse into it.
+_HELP_DEBOUNCE_SECONDS = 10.0
+_LAST_HELP: dict = {}  # room_id -> monotonic timestamp of last alert
+_HELP_LOCK = threading.Lock()
+
+
 @app.post("/room/{room_id}/help")
 async def room_call_help(room_id: str, resident_name: str = Form(...)):
     """Handle 'Call for Help' button — creates emergency alert."""
+    now = time.monotonic()
+    with _HELP_LOCK:
+        last = _LAST_HELP.get(room_id, 0.0)
+        if now - last < _HELP_DEBOUNCE_SECONDS:
+            # Duplicate press; the alert from a moment ago already covers it
+            return RedirectResponse(url=f"/room/{room_id}?helped=1", status_code=303)
+        _LAST_HELP[room_id] = now
     alert = AlertCreate(
         room_id=room_id,
         resident_name=resident_name,
@@ -672,27 +1296,13 @@ async def room_call_help(room_id: str, resident_name: str = Form(...)):
         message="Resident requested help via button",
         severity="emergency",
     )
-    create_alert(alert)
+    await asyncio.to_thread(create_alert, alert)
     return RedirectResponse(url=f"/room/{room_id}?helped=1", status_code=303)
 
 
-@app.get("/staff", response_class=HTMLResponse)
-async def staff_view(
-    request: Request,
-    room_id: Optional[str] = None,
-    severity: Optional[str] = None,
-    status: Optional[str] = None,
-    staff=Depends(get_current_staff),
-):
-    """Staff portal — alert dashboard with room status cards. Requires auth."""
-    if not staff:
-        return RedirectResponse(url="/staff/login", status_code=303)
-
-    rooms = get_rooms()
-    conn = get_db_connection()
-    cursor = conn.cursor()
-
-    # Build filter query
+def _query_filtered_alerts(room_id: Optional[str], severity: Optional[str],
+                           status: Optional[str]) -> list:
+    """Most recent alerts matching the staff dashboard filters."""
     conditions = []
     params = []
     if room_id:
@@ -706,70 +1316,106 @@ async def staff_view(
         params.append(status)
 
     where = " AND ".join(conditions)
-    query = "SELECT * FROM alerts"
+    query = f"SELECT {_ALERT_COLS} FROM alerts"
     if where:
         query += f" WHERE {where}"
     query += " ORDER BY created_at DESC LIMIT 100"
 
-    cursor.execute(query, params)
-    rows = cursor.fetchall()
-
-    # Room summary data
-    room_help_counts = {}
-    room_orientation_counts = {}
-    room_active_alerts = {}
-    room_latest_severity = {}
+    conn = get_db_connection()
+    try:
+        cursor = conn.cursor()
+        cursor.arraysize = 100  # one batch for the whole LIMITed result
+        cursor.execute(query, params)
+        return cursor.fetchall()
+    finally:
+        conn.close()
 
-    for rid in rooms.keys():
-        cursor.execute(
-            """SELECT COUNT(*) FROM alerts
-               WHERE room_id = ? AND type = 'help'
-               AND datetime(created_at) >= datetime('now', '-30 minutes')""",
-            (rid,),
-        )
-        room_help_counts[rid] = cursor.fetchone()[0]
 
-        cursor.execute(
-            """SELECT COUNT(*) FROM questions
-               WHERE room_id = ?
-               AND datetime(created_at) >= datetime('now', '-7 days')
-               AND (lower(question) LIKE '%where am i%'
-                    OR lower(question) LIKE '%what time%'
-                    OR lower(question) LIKE '%what day%')""",
-            (rid,),
-        )
-        room_orientation_counts[rid] = cursor.fetchone()[0]
+# Short-TTL cache of the assembled dashboard data (alert rows + room stats)
+# keyed by the filter combination. The rendered HTML itself can't be cached —
+# it embeds the viewer's name and CSRF token — but the query fan-out behind
+# it is identical for every staff member polling the same filters. The epoch
+# is bumped on alert mutations so a staff member's own ack/resolve is visible
+# on the very next load rather than after the TTL.
+# LRU-bounded: the key space is attacker-controlled (any authenticated user
+# can iterate arbitrary ?room_id= values), so an unbounded dict would grow
+# without limit. Only touched from the event loop, so no lock needed.
+_STAFF_DATA_CACHE: OrderedDict = OrderedDict()  # filters -> (epoch, monotonic ts, alerts, room_stats)
+_STAFF_DATA_CACHE_MAX = 64
+_STAFF_DATA_TTL = 2.0
+_STAFF_DATA_EPOCH = 0
+
+
+def _bump_staff_data_epoch():
+    global _STAFF_DATA_EPOCH
+    _STAFF_DATA_EPOCH += 1
+
+
+async def _staff_dashboard_data(room_id, severity, status) -> tuple:
+    """(alerts, room_stats) for the dashboard, cached for a couple seconds."""
+    key = (room_id or "", severity or "", status or "")
+    epoch = _STAFF_DATA_EPOCH
+    entry = _STAFF_DATA_CACHE.get(key)
+    if entry is not None:
+        cached_epoch, cached_at, alerts, room_stats = entry
+        if cached_epoch == epoch and time.monotonic() - cached_at < _STAFF_DATA_TTL:
+            _STAFF_DATA_CACHE.move_to_end(key)
+            return alerts, room_stats
 
-        cursor.execute(
-            """SELECT COUNT(*) FROM alerts WHERE room_id = ? AND status != 'resolved'""",
-            (rid,),
-        )
-        room_active_alerts[rid] = cursor.fetchone()[0]
+    rooms = get_rooms()
 
-        cursor.execute(
-            """SELECT severity FROM alerts WHERE room_id = ? AND status != 'resolved'
-               ORDER BY created_at DESC LIMIT 1""",
-            (rid,),
+    # Filtered alert list and the grouped room stats run concurrently,
+    # all off the event loop
+    rows, (help_counts, orientation_counts, active_counts) = \
+        await asyncio.gather(
+            asyncio.to_thread(_query_filtered_alerts, room_id, severity, status),
+            _room_summary_stats(),
         )
-        sev_row = cursor.fetchone()
-        room_latest_severity[rid] = sev_row[0] if sev_row else None
-
-    conn.close()
+    # One record per room instead of four parallel dicts: the template does a
+    # single lookup per stat rather than indexing a dict by room id each time.
+    room_stats = [
+        {
+            "rid": rid,
+            "resident_name": profile["resident_name"],
+            "mode": profile["mode"],
+            "help_30m": help_counts.get(rid, 0),
+            "orient_7d": orientation_counts.get(rid, 0),
+            "active": active_counts.get(rid, 0),
+            "severity": profile["latest_active_severity"],
+        }
+        for rid, profile in rooms.items()
+    ]
 
     alerts = [dict(row) for row in rows]
     for alert in alerts:
         profile = rooms.get(alert["room_id"], {})
         alert["mode"] = profile.get("mode", "standard")
 
+    _STAFF_DATA_CACHE[key] = (epoch, time.monotonic(), alerts, room_stats)
+    _STAFF_DATA_CACHE.move_to_end(key)
+    while len(_STAFF_DATA_CACHE) > _STAFF_DATA_CACHE_MAX:
+        _STAFF_DATA_CACHE.popitem(last=False)
+    return alerts, room_stats
+
+
+@app.get("/staff", response_class=HTMLResponse)
+async def staff_view(
+    request: Request,
+    room_id: Optional[str] = None,
+    severity: Optional[str] = None,
+    status: Optional[str] = None,
+    staff=Depends(get_current_staff),
+):
+    """Staff portal — alert dashboard with room status cards. Requires auth."""
+    if not staff:
+        return RedirectResponse(url="/staff/login", status_code=303)
+
+    alerts, room_stats = await _staff_dashboard_data(room_id, severity, status)
+
     return templates.TemplateResponse(
-        "staff.html", {
-            "request": request,
+        request, "staff.html", {
             "alerts": alerts,
-            "profiles": rooms,
-            "room_help_counts": room_help_counts,
-            "room_orientation_counts": room_orientation_counts,
-            "room_active_alerts": room_active_alerts,
-            "room_latest_severity": room_latest_severity,
+            "room_stats": room_stats,
             "filter_room": room_id or "",
             "filter_severity": severity or "",
             "filter_status": status or "",
@@ -780,8 +1426,11 @@ async def staff_view(
     )
 
 
+# The handlers below run blocking sqlite (and, for account management,
+# Argon2 hashing) with no awaits, so they're plain `def`: FastAPI dispatches
+# them on the threadpool instead of stalling the event loop.
 @app.post("/staff/alerts/{alert_id}/ack")
-async def staff_ack_alert(
+def staff_ack_alert(
     alert_id: int,
     notes: str = Form(""),
     csrf: str = Form(""),
@@ -790,14 +1439,14 @@ async def staff_ack_alert(
     """Acknowledge an alert with optional notes."""
     if not staff:
         return RedirectResponse(url="/staff/login", status_code=303)
-    if csrf != staff.get("csrf_token"):
+    if not _csrf_ok(csrf, staff.get("csrf_token")):
         raise HTTPException(status_code=403, detail="Invalid CSRF token")
     acknowledge_alert(alert_id, staff_name=staff["staff_name"], notes=notes.strip() or None)
     return RedirectResponse(url="/staff", status_code=303)
 
 
 @app.post("/staff/alerts/{alert_id}/resolve")
-async def staff_resolve_alert(
+def staff_resolve_alert(
     alert_id: int,
     notes: str = Form(""),
     csrf: str = Form(""),
@@ -806,14 +1455,14 @@ async def staff_resolve_alert(
     """Resolve an alert with optional notes."""
     if not staff:
         return RedirectResponse(url="/staff/login", status_code=303)
-    if csrf != staff.get("csrf_token"):
+    if not _csrf_ok(csrf, staff.get("csrf_token")):
         raise HTTPException(status_code=403, detail="Invalid CSRF token")
     resolve_alert(alert_id, staff_name=staff["staff_name"], notes=notes.strip() or None)
     return RedirectResponse(url="/staff", status_code=303)
 
 
 @app.post("/staff/rooms/{room_id}/edit")
-async def staff_edit_room(
+def staff_edit_room(
     room_id: str,
     resident_name: str = Form(...),
     mode: str = Form(...),
@@ -823,7 +1472,7 @@ async def staff_edit_room(
     """Edit a room's resident name or care mode."""
     if not staff:
         return RedirectResponse(url="/staff/login", status_code=303)
-    if csrf != staff.get("csrf_token"):
+    if not _csrf_ok(csrf, staff.get("csrf_token")):
         raise HTTPException(status_code=403, detail="Invalid CSRF token")
 
     conn = get_db_connection()
@@ -834,6 +1483,7 @@ async def staff_edit_room(
     )
     conn.commit()
     conn.close()
+    update_rooms_cache(room_id, resident_name.strip(), mode)
     return RedirectResponse(url="/staff", status_code=303)
 
 
@@ -842,7 +1492,7 @@ async def staff_edit_room(
 # ==========================
 
 @app.get("/staff/manage", response_class=HTMLResponse)
-async def staff_manage_page(request: Request, staff=Depends(get_current_staff)):
+def staff_manage_page(request: Request, staff=Depends(get_current_staff)):
     """Staff account management — admin only."""
     if not staff:
         return RedirectResponse(url="/staff/login", status_code=303)
@@ -854,8 +1504,7 @@ async def staff_manage_page(request: Request, staff=Depends(get_current_staff)):
     conn.close()
 
     return templates.TemplateResponse(
-        "staff_manage.html", {
-            "request": request,
+        request, "staff_manage.html", {
             "staff_list": staff_list,
             "staff_name": staff["staff_name"],
             "staff_role": staff["role"],
@@ -865,7 +1514,7 @@ async def staff_manage_page(request: Request, staff=Depends(get_current_staff)):
 
 
 @app.post("/staff/manage/create")
-async def staff_manage_create(
+def staff_manage_create(
     request: Request,
     username: str = Form(...),
     display_name: str = Form(...),
@@ -879,7 +1528,7 @@ async def staff_manage_create(
         return RedirectResponse(url="/staff/login", status_code=303)
     if staff["role"] != "admin":
         raise HTTPException(status_code=403, detail="Admin access required")
-    if csrf != staff.get("csrf_token"):
+    if not _csrf_ok(csrf, staff.get("csrf_token")):
         raise HTTPException(status_code=403, detail="Invalid CSRF token")
 
     if role not in ("nurse", "admin", "supervisor"):
@@ -897,7 +1546,7 @@ async def staff_manage_create(
 
 
 @app.post("/staff/manage/{staff_id}/edit")
-async def staff_manage_edit(
+def staff_manage_edit(
     staff_id: int,
     display_name: str = Form(...),
     role: str = Form(...),
@@ -910,7 +1559,7 @@ async def staff_manage_edit(
         return RedirectResponse(url="/staff/login", status_code=303)
     if staff["role"] != "admin":
         raise HTTPException(status_code=403, detail="Admin access required")
-    if csrf != staff.get("csrf_token"):
+    if not _csrf_ok(csrf, staff.get("csrf_token")):
         raise HTTPException(status_code=403, detail="Invalid CSRF token")
 
     if role not in ("nurse", "admin", "supervisor"):
@@ -926,7 +1575,7 @@ async def staff_manage_edit(
 
 
 @app.post("/staff/manage/{staff_id}/deactivate")
-async def staff_manage_deactivate(
+def staff_manage_deactivate(
     staff_id: int,
     csrf: str = Form(""),
     staff=Depends(get_current_staff),
@@ -936,7 +1585,7 @@ async def staff_manage_deactivate(
         return RedirectResponse(url="/staff/login", status_code=303)
     if staff["role"] != "admin":
         raise HTTPException(status_code=403, detail="Admin access required")
-    if csrf != staff.get("csrf_token"):
+    if not _csrf_ok(csrf, staff.get("csrf_token")):
         raise HTTPException(status_code=403, detail="Invalid CSRF token")
 
     # Prevent self-deactivation
@@ -946,6 +1595,8 @@ async def staff_manage_deactivate(
     conn = get_db_connection()
     auth.deactivate_staff(conn, staff_id)
     conn.close()
+    # Their tokens aren't known here, so drop every cached session
+    _invalidate_session_cache()
     return RedirectResponse(url="/staff/manage", status_code=303)
 
 
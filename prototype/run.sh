@@ -18,4 +18,5 @@ echo "Default admin login: admin / admin1234"
 echo ""
 
 uvicorn main:app --host 0.0.0.0 --port 8000 \
+    --loop uvloop --http httptools \
     --ssl-keyfile certs/server.key --ssl-certfile certs/server.crt